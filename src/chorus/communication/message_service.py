@@ -200,14 +200,27 @@ class ChorusMessageRouter:
         
         Args:
             identity: ZMQ identity of the agent
-            zmq_message: Message containing a chorus Message object
+            zmq_message: Message containing a chorus Message object, or a batch of them
         """
         payload = zmq_message.payload
-        if "message" not in payload:
+        if "message" in payload:
+            message_dicts = [payload["message"]]
+        elif "messages" in payload:
+            message_dicts = payload["messages"]
+        else:
             logger.error("Agent message without message payload")
             return
-            
-        message_dict = payload["message"]
+
+        for message_dict in message_dicts:
+            self._route_agent_message(zmq_message.agent_id, message_dict)
+
+    def _route_agent_message(self, sender_agent_id: Optional[str], message_dict: Dict):
+        """Add an agent message to the global message pool and forward it to its recipients.
+        
+        Args:
+            sender_agent_id: ID of the agent that sent the message
+            message_dict: Serialized chorus Message object
+        """
         message = Message.model_validate(message_dict)
         
         # Add to global message history
@@ -224,7 +237,7 @@ class ChorusMessageRouter:
             
             # Broadcast to other relevant agents
             for target_agent_id, target_identity in self._agent_identities.items():
-                if target_agent_id != zmq_message.agent_id:
+                if target_agent_id != sender_agent_id:
                     # Check if this agent should receive the message
                     if (message.destination == target_agent_id or 
                         (message.channel is not None and self._is_agent_in_channel(target_agent_id, message.channel))):
@@ -301,6 +314,20 @@ class ChorusMessageRouter:
             List of all messages
         """
         return self._message_history
+
+    def fetch_messages_since(self, start: int) -> List[Message]:
+        """Fetch the messages added to the global pool after the first ``start`` messages.
+        
+        The pool only grows, so callers can keep the number of messages they have seen and
+        fetch just the new ones.
+        
+        Args:
+            start: Number of messages already fetched
+            
+        Returns:
+            List of messages added since then
+        """
+        return self._message_history[start:]
     
     def filter_messages(self, source: Optional[str] = None, destination: Optional[str] = None, 
                         channel: Optional[str] = None) -> List[Message]:
@@ -706,11 +733,37 @@ class ChorusMessageClient:
     def send_messages(self, messages: List[Message]):
         """Send multiple messages to the router.
         
+        The messages are sent in a single ZMQ frame, so a batch costs one round of
+        serialization and socket I/O instead of one per message.
+        
         Args:
             messages: List of messages to send
         """
+        if len(messages) <= 1:
+            for message in messages:
+                self.send_message(message)
+            return
+
+        message_dicts = []
         for message in messages:
-            self.send_message(message)
+            if message.message_id is None:
+                message.message_id = str(uuid.uuid4().hex)
+
+            # Add to local message history
+            if message.message_id not in self._local_message_ids:
+                self._message_history.append(message)
+                self._local_message_ids.add(message.message_id)
+            message_dicts.append(message.model_dump())
+
+        # Send to router
+        try:
+            self._send_to_router(ZMQMessage(
+                msg_type=MessageType.AGENT_MESSAGE,
+                agent_id=self.agent_id,
+                payload={"messages": message_dicts}
+            ))
+        except Exception as e:
+            logger.error(f"Error sending messages: {e}")
 
     def get_team_info(self) -> Optional[Dict]:
         """Get the team info for this agent if available.
@@ -45,6 +45,7 @@ class DirectMessageViewSelector(MessageViewSelector):
         source = incoming_message.source
         destination = incoming_message.destination
         channel = incoming_message.channel
+        incoming_message_id = incoming_message.message_id
         
         # Filter messages that are direct communications between these parties in the same channel
         filtered_messages = []
@@ -59,7 +60,7 @@ class DirectMessageViewSelector(MessageViewSelector):
                 filtered_messages.append(msg)
                 
             # Stop once we reach the incoming message
-            if msg.message_id == incoming_message.message_id:
+            if msg.message_id == incoming_message_id:
                 break
         
         # Return the filtered messages
@@ -82,6 +83,7 @@ class ChannelMessageViewSelector(MessageViewSelector):
         channel = incoming_message.channel
         source = incoming_message.source
         destination = incoming_message.destination
+        incoming_message_id = incoming_message.message_id
         
         # Check if this is a direct message
         if source and destination and source != destination:
@@ -94,7 +96,7 @@ class ChannelMessageViewSelector(MessageViewSelector):
                     filtered_messages.append(msg)
                 
                 # Stop once we reach the incoming message
-                if msg.message_id == incoming_message.message_id:
+                if msg.message_id == incoming_message_id:
                     break
             view_id = f"direct_message:{source}"
         else:
@@ -105,7 +107,7 @@ class ChannelMessageViewSelector(MessageViewSelector):
                     filtered_messages.append(msg)
                 
                 # Stop once we reach the incoming message
-                if msg.message_id == incoming_message.message_id:
+                if msg.message_id == incoming_message_id:
                     break
             view_id = f"channel:{channel}"
             
@@ -123,11 +125,12 @@ class GlobalMessageViewSelector(MessageViewSelector):
         """
         Selects all messages in the message history.
         """
-        filtered_messages = []
-        for msg in message_history:
-            filtered_messages.append(msg)
-            # Stop once we reach the incoming message
-            if msg.message_id == incoming_message.message_id:
+        # Find the incoming message and take everything up to it in a single slice
+        incoming_message_id = incoming_message.message_id
+        end = len(message_history)
+        for index, msg in enumerate(message_history):
+            if msg.message_id == incoming_message_id:
+                end = index + 1
                 break
 
-        return MessageView(view_id="global", messages=filtered_messages)
+        return MessageView(view_id="global", messages=message_history[:end])
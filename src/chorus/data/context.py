@@ -1,16 +1,20 @@
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 import uuid
 
 from pydantic import BaseModel
 from pydantic import ConfigDict
 from pydantic import Field
+from pydantic import PrivateAttr
 
 from chorus.communication.message_view_selectors import GlobalMessageViewSelector, MessageViewSelector
 from chorus.data.agent_status import AgentStatus
 from chorus.data.executable_tool import ExecutableTool
 from chorus.data.resource import Resource
+from chorus.data.toolschema import Action
+from chorus.data.toolschema import ToolSchema
 from chorus.data.team_info import TeamInfo
 from chorus.util.status_manager import MultiAgentStatusManager
 from chorus.communication.message_service import ChorusMessageClient
@@ -74,6 +78,11 @@ class AgentContext(OrchestrationContext):
     status_manager: Optional[MultiAgentStatusManager] = None
     async_execution_cache: Dict[str, AsyncExecutionRecord] = Field(default_factory=dict)
 
+    # Tools the schema cache was built from, their schemas, and the tool -> action lookup map
+    _tool_schema_cache: Optional[
+        Tuple[Tuple[ExecutableTool, ...], List[ToolSchema], Dict[str, Dict[str, Action]]]
+    ] = PrivateAttr(default=None)
+
     def get_tools(self) -> List[ExecutableTool]:
         """Get list of executable tools available to the agent.
 
@@ -82,6 +91,41 @@ class AgentContext(OrchestrationContext):
         """
         return self.tools if self.tools is not None else []
 
+    def _get_tool_schema_cache(self):
+        tools = tuple(self.get_tools())
+        cache = self._tool_schema_cache
+        # Tools define no __eq__, so this only matches when the same tool objects are in place
+        if cache is None or cache[0] != tools:
+            tool_schemas = [tool.get_schema() for tool in tools]
+            tool_action_map = {}
+            for schema in tool_schemas:
+                actions = tool_action_map.setdefault(schema.tool_name, {})
+                for action in schema.actions:
+                    actions[action.name] = action
+            cache = (tools, tool_schemas, tool_action_map)
+            self._tool_schema_cache = cache
+        return cache
+
+    def get_tool_schemas(self) -> List[ToolSchema]:
+        """Get the schemas of the tools available to the agent.
+
+        Schemas are cached and rebuilt only when the tools change.
+
+        Returns:
+            List of ToolSchema objects in the same order as the tools.
+        """
+        return self._get_tool_schema_cache()[1]
+
+    def get_tool_action_map(self) -> Dict[str, Dict[str, Action]]:
+        """Get a mapping from tool name and action name to the action's schema.
+
+        The mapping is cached and rebuilt only when the tools change.
+
+        Returns:
+            Dictionary mapping tool names to dictionaries of action names to Action schemas.
+        """
+        return self._get_tool_schema_cache()[2]
+
     def get_resources(self) -> List[Resource]:
         """Get list of resources available to the agent.
 
@@ -56,6 +56,19 @@ class ExecutableTool(Registrable, metaclass=ABCMeta):
         """
         return False
 
+    def supports_concurrent_execution(self):
+        """Checks if actions of this tool can run concurrently with other actions.
+
+        Tools should only opt in when their actions are independent and thread-safe, such as
+        stateless HTTP lookups. An action returning async observation data stops the actions
+        after it from running, but the other actions of its concurrent batch have already run,
+        so their observations are returned along with the async one.
+
+        Returns:
+            bool: False by default, indicating actions run one at a time in order.
+        """
+        return False
+
     @abstractmethod
     def execute(self, action_name: Optional[str] = None, parameters: JsonData = None) -> JsonData:
         """Executes the tool with given action and parameters.
@@ -32,6 +32,8 @@ class ChorusGlobalContext:
         """
         # Initialize attributes with defaults
         self.global_message_ids = set()
+        # Number of router messages already merged into the message history
+        self._router_messages_synced = 0
         self.channels = {}
         self.human_identifier = DEFAULT_HUMAN_IDENTIFIER
         self.zmq_router_port = zmq_router_port
@@ -173,7 +175,10 @@ class ChorusGlobalContext:
         """
         # Update with the latest messages from the router
         if hasattr(self, "_message_router"):
-            router_messages = self._message_router.fetch_all_messages()
+            router_messages = self._message_router.fetch_messages_since(
+                self._router_messages_synced
+            )
+            self._router_messages_synced += len(router_messages)
             for msg in router_messages:
                 if msg.message_id not in self.global_message_ids:
                     self._message_history.append(msg)
@@ -12,3 +12,13 @@ class ToolExecutor(ABC):
         """
         Execute an action.
         """
+
+    def supports_concurrent_execution(self, action: ActionData) -> bool:
+        """
+        Check if an action can run concurrently with other actions.
+
+        An action returning async observation data stops the actions after it from running,
+        but the other actions of its concurrent batch have already run, so their observations
+        are returned along with the async one.
+        """
+        return False
@@ -39,6 +39,18 @@ class SimpleToolExecutor(ToolExecutor):
         self._agent_context = agent_context
         self._tolerate_error = tolerate_error
 
+    def supports_concurrent_execution(self, action: ActionData) -> bool:
+        """Checks if an action can run concurrently with other actions.
+
+        Args:
+            action: The action to check.
+
+        Returns:
+            True if the action's tool is registered and opts in to concurrent execution.
+        """
+        tool_object = self._tool_map.get(action.tool_name)
+        return tool_object is not None and tool_object.supports_concurrent_execution()
+
     def execute(self, action: ActionData) -> Any:
         """Executes an action call and returns the observation.
 
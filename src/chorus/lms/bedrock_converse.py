@@ -1,9 +1,12 @@
 import json
 import os
 import sys
+import threading
 import time
+from typing import Any
 from typing import Dict
 from typing import Optional
+from typing import Tuple
 
 import boto3
 import botocore.errorfactory
@@ -22,6 +25,44 @@ ACCEPT = "application/json"
 CONTENT_TYPE = "application/json"
 
 
+# bedrock-runtime clients by (process id, region). Creating a client costs far more than a
+# short completion, and a reused client keeps its connection pool warm between turns.
+_BEDROCK_CLIENTS: Dict[Tuple[int, str], Any] = {}
+_BEDROCK_CLIENTS_LOCK = threading.Lock()
+
+
+def _get_bedrock_client(region: str):
+    """Returns a shared bedrock-runtime client for the region.
+
+    boto3 clients are thread-safe, but sessions are not, so each client is created under a
+    lock. Clients are keyed by process id as well so that forked agent processes do not share
+    connections with their parent.
+    """
+    key = (os.getpid(), region)
+    bedrock_client = _BEDROCK_CLIENTS.get(key)
+    if bedrock_client is None:
+        with _BEDROCK_CLIENTS_LOCK:
+            bedrock_client = _BEDROCK_CLIENTS.get(key)
+            if bedrock_client is None:
+                try:
+                    session = boto3.Session()
+                except botocore.exceptions.ProfileNotFound:
+                    session = boto3.Session()
+                retry_config = Config(
+                    region_name=region,
+                    retries={
+                        "max_attempts": 10,
+                        "mode": "standard",
+                    },
+                )
+                bedrock_client = session.client(
+                    service_name="bedrock-runtime",
+                    config=retry_config,
+                )
+                _BEDROCK_CLIENTS[key] = bedrock_client
+    return bedrock_client
+
+
 class BedrockConverseAPIClient(LanguageModelClient):
     """Client for interacting with Amazon Bedrock Converse API.
 
@@ -72,24 +113,10 @@ class BedrockConverseAPIClient(LanguageModelClient):
             prompt_dict = prompt.to_dict()
 
         # Prepare client
-        try:
-            session = boto3.Session()
-        except botocore.exceptions.ProfileNotFound:
-            session = boto3.Session()
         target_region = os.environ.get("AWS_REGION", region)
         if model_name is None:
             model_name = self._model_name
-        retry_config = Config(
-            region_name=target_region,
-            retries={
-                "max_attempts": 10,
-                "mode": "standard",
-            },
-        )
-        bedrock_client = session.client(
-            service_name="bedrock-runtime",
-            config=retry_config,
-        )
+        bedrock_client = _get_bedrock_client(target_region)
 
         # Prepare options
         lm_options = self.get_default_options().copy()
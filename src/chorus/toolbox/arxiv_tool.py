@@ -1,4 +1,6 @@
 import arxiv  # type: ignore
+import queue
+import threading
 from typing import Dict
 from chorus.data.executable_tool import ExecutableTool
 from chorus.data.executable_tool import SimpleExecutableTool
@@ -40,8 +42,6 @@ class ArxivRetrieverTool(SimpleExecutableTool):
         super().__init__(ToolSchema.model_validate(schema))
 
     def search(self, query: str, num_results: int = 10):
-        import time
-        
         # Add a small delay before executing the search to prevent potential rate limiting
         time.sleep(1)
         
@@ -51,9 +51,6 @@ class ArxivRetrieverTool(SimpleExecutableTool):
             
             
             # Create a timeout for the search
-            import threading
-            import queue
-            
             # Queue for results
             result_queue = queue.Queue()
             
@@ -101,5 +98,4 @@ class ArxivRetrieverTool(SimpleExecutableTool):
                 return {"articles": [], "error": "No results received from search thread"}
                 
         except Exception as e:
-            import traceback
             return {"articles": [], "error": str(e)}
@@ -1,10 +1,19 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from datetime import timedelta
+from typing import List
 
 from chorus.data.executable_tool import ExecutableTool
 from chorus.data.executable_tool import SimpleExecutableTool
 from chorus.data.toolschema import ToolSchema
+from chorus.toolbox.search_hit import SearchHit
+
+# The Custom Search JSON API returns at most 10 items per request and refuses to page past
+# the 100th result.
+CSE_PAGE_SIZE = 10
+CSE_MAX_RESULTS = 100
+CSE_ENGINE_ID = "002495992715835815419:gig2feazcnw"
 
 
 @ExecutableTool.register("GoogleWebSearchTool")
@@ -25,7 +34,11 @@ class GoogleWebSearchTool(SimpleExecutableTool):
                     "input_schema": {
                         "type": "object",
                         "properties": {
-                            "query": {"type": "string", "description": "Search keywords"}
+                            "query": {"type": "string", "description": "Search keywords"},
+                            "num_results": {
+                                "type": "number",
+                                "description": "Number of results, optional.",
+                            },
                         },
                         "required": ["query"],
                     },
@@ -35,8 +48,12 @@ class GoogleWebSearchTool(SimpleExecutableTool):
         }
         super().__init__(ToolSchema.model_validate(schema))
 
-    def search(self, query: str):
+    def supports_concurrent_execution(self):
+        return True
+
+    def search(self, query: str, num_results: int = CSE_PAGE_SIZE):
         from googleapiclient.discovery import build
+        from googleapiclient.http import build_http
 
         api_key = os.getenv("GOOGLE_WEB_SEARCH_API_KEY", None)
         if not api_key:
@@ -44,26 +61,42 @@ class GoogleWebSearchTool(SimpleExecutableTool):
         service = build("customsearch", "v1", developerKey=api_key)
         date_string_three_month_ago = (datetime.now() - timedelta(days=90)).strftime("%Y%m%d")
         date_string_tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y%m%d")
-        res = (
-            service.cse()
-            .list(
-                q=query,
-                cx="002495992715835815419:gig2feazcnw",
-                sort=f"date:r:{date_string_three_month_ago}:{date_string_tomorrow}",
-                num=10,
+        sort = f"date:r:{date_string_three_month_ago}:{date_string_tomorrow}"
+        num_results = max(1, min(int(num_results), CSE_MAX_RESULTS))
+
+        def fetch_page(start: int):
+            return (
+                service.cse()
+                .list(
+                    q=query,
+                    cx=CSE_ENGINE_ID,
+                    sort=sort,
+                    start=start,
+                    num=min(CSE_PAGE_SIZE, num_results - start + 1),
+                )
+                .execute(http=build_http())
             )
-            .execute()
-        )
-        if "items" in res:
-            items = res["items"]
-            results = []
-            for item in items:
-                result = {
-                    "title": item["title"],
-                    "url": item["link"],
-                    "snippet": item["snippet"],
-                }
-                results.append(result)
+
+        # Every request is billed, so only ask for more pages once the first one says that
+        # more results exist
+        pages = [fetch_page(1)]
+        if "nextPage" in pages[0].get("queries", {}):
+            total_results = int(pages[0].get("searchInformation", {}).get("totalResults", 0))
+            num_results = min(num_results, total_results)
+            # The remaining pages are independent, blocking HTTP calls, so fetch them
+            # concurrently and collapse the items back in page order. Each page gets its own
+            # transport since httplib2 connections are not thread-safe.
+            starts = range(1 + CSE_PAGE_SIZE, num_results + 1, CSE_PAGE_SIZE)
+            if starts:
+                with ThreadPoolExecutor(max_workers=len(starts)) as pool:
+                    pages.extend(pool.map(fetch_page, starts))
+
+        results: List[SearchHit] = [
+            {"title": item["title"], "url": item["link"], "snippet": item["snippet"]}
+            for res in pages
+            for item in res.get("items", [])
+        ]
+        if results:
             return results
         else:
 
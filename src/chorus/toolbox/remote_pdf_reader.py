@@ -1,12 +1,30 @@
+import importlib.util
 import json
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 import io
 
-import requests
 from chorus.data.executable_tool import SimpleExecutableTool, ExecutableTool
 from chorus.data.toolschema import ToolSchema
+from chorus.util.http_client import create_http_client
+
+MAX_PDF_BYTES = 50 * 1024 * 1024
+
+
+# pdfplumber, imported on first use
+_pdfplumber = None
+
+
+def _import_pdfplumber():
+    global _pdfplumber
+    if _pdfplumber is None:
+        import pdfplumber
+        _pdfplumber = pdfplumber
+    return _pdfplumber
+
 
 @ExecutableTool.register("RemotePDFReaderTool")
 class RemotePDFReaderTool(SimpleExecutableTool):
@@ -14,9 +32,9 @@ class RemotePDFReaderTool(SimpleExecutableTool):
     An implemented tool for reading PDF files.
     """
     def __init__(self):
-        try:
-            import pdfplumber
-        except:
+        # Only check availability here; the import itself is deferred so that it can overlap
+        # with the first download.
+        if importlib.util.find_spec("pdfplumber") is None:
             raise ValueError("Error: Please install pdfplumber package to use this tool.")
         schema = {
             "tool_name": "RemotePDFReaderTool",
@@ -43,22 +61,55 @@ class RemotePDFReaderTool(SimpleExecutableTool):
             ]
         }
         super().__init__(ToolSchema.model_validate(schema))
+        self._client = create_http_client(timeout=30)
+
+    def supports_concurrent_execution(self):
+        return True
+
+    def _fetch(self, url: str) -> io.BytesIO:
+        # Headers arrive before the body, so non-PDF and oversized responses are rejected
+        # without transferring them.
+        with self._client.stream("GET", url) as response:
+            if response.status_code != 200:
+                raise ValueError(f"Failed to fetch PDF file from {url}.")
+            content_type = response.headers.get("Content-Type", "").lower()
+            if content_type and "pdf" not in content_type and "octet-stream" not in content_type:
+                raise ValueError(f"{url} is not a PDF file (Content-Type: {content_type}).")
+            too_large = f"PDF file at {url} is larger than {MAX_PDF_BYTES} bytes."
+            if int(response.headers.get("Content-Length") or 0) > MAX_PDF_BYTES:
+                raise ValueError(too_large)
+            pdf = io.BytesIO()
+            for chunk in response.iter_bytes(65536):
+                pdf.write(chunk)
+                if pdf.tell() > MAX_PDF_BYTES:
+                    raise ValueError(too_large)
+        pdf.seek(0)
+        return pdf
+
+    def _fetch_with_pdfplumber(self, url: str):
+        """Fetches a PDF and returns it with the pdfplumber module."""
+        if "pdfplumber" in sys.modules:
+            return self._fetch(url), _import_pdfplumber()
+        # PDFs are indexed from the trailer, so parsing cannot start before the body is
+        # complete; the first time, load pdfplumber in the background while the bytes arrive.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pdfplumber_future = pool.submit(_import_pdfplumber)
+            pdf = self._fetch(url)
+            return pdf, pdfplumber_future.result()
 
     def read(self, url: str):
-        import pdfplumber
-        response = requests.get(url)
-        if response.status_code == 200:
-            pdf = io.BytesIO(response.content)
-            with pdfplumber.open(pdf) as pdf_file:
-                content = ""
-                for i, page in enumerate(pdf_file.pages[:10]):
-                    content += f"### Page {i + 1} ###\n\n"
-                    text = page.extract_text(x_tolerance=1)
-                    tables = page.extract_tables()
-                    for table in tables:
-                        content += "Table:\n" + str(table) + "\n\n"
-                    content += text
-                content = content.strip()
-                return content
-        else:
-            return f"Error: Failed to fetch PDF file from {url}."
+        try:
+            pdf, pdfplumber = self._fetch_with_pdfplumber(url)
+        except ValueError as e:
+            return f"Error: {e}"
+        with pdfplumber.open(pdf) as pdf_file:
+            content = ""
+            for i, page in enumerate(pdf_file.pages[:10]):
+                content += f"### Page {i + 1} ###\n\n"
+                text = page.extract_text(x_tolerance=1)
+                tables = page.extract_tables()
+                for table in tables:
+                    content += "Table:\n" + str(table) + "\n\n"
+                content += text
+            content = content.strip()
+            return content
@@ -0,0 +1,16 @@
+from typing import NotRequired
+from typing import Optional
+from typing import TypedDict
+
+
+class SearchHit(TypedDict):
+    """A single web search result returned by the search tools.
+
+    Hits stay plain dicts so that observations serialize as JSON objects with named fields;
+    this type only documents their shape.
+    """
+
+    title: str
+    url: str
+    snippet: str
+    date: NotRequired[Optional[str]]
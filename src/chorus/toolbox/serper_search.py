@@ -1,11 +1,17 @@
 import json
 import os
 from datetime import datetime, timedelta
+from typing import List
 from typing import Optional
 
-import requests
 from chorus.data.executable_tool import SimpleExecutableTool, ExecutableTool
 from chorus.data.toolschema import ToolSchema
+from chorus.toolbox.search_hit import SearchHit
+from chorus.util.http_client import create_http_client
+
+SERPER_SEARCH_URL = "https://google.serper.dev/search"
+# Everything after the query in the request body, restricting results to the past month.
+SERPER_PAYLOAD_SUFFIX = b',"tbs":"qdr:m"}'
 
 @ExecutableTool.register("SerperWebSearchTool")
 class SerperWebSearchTool(SimpleExecutableTool):
@@ -18,6 +24,9 @@ class SerperWebSearchTool(SimpleExecutableTool):
         if not self._api_key:
             raise ValueError("Error: Please provide your Serper API key in the environment variable SERPER_WEB_SEARCH_API_KEY.")
         self._search_prefix = None
+        self._client = create_http_client(
+            headers={"X-API-KEY": self._api_key, "Content-Type": "application/json"}
+        )
         schema = {
             "tool_name": "WebSearchTool",
             "name": "WebSearchTool",
@@ -44,6 +53,9 @@ class SerperWebSearchTool(SimpleExecutableTool):
         }
         super().__init__(ToolSchema.model_validate(schema))
 
+    def supports_concurrent_execution(self):
+        return True
+
     def set_search_prefix(self, prefix: Optional[str]):
         self._search_prefix = prefix
 
@@ -51,37 +63,27 @@ class SerperWebSearchTool(SimpleExecutableTool):
         if not self._api_key:
             return "Error: Please provide your Serper API key in the environment variable SERPER_WEB_SEARCH_API_KEY."
 
-        url = "https://google.serper.dev/search"
-
         if self._search_prefix:
             query = f"{self._search_prefix} {query}"
 
-        payload = json.dumps({
-            "q": query,
-            "tbs": "qdr:m"
-        })
-        headers = {
-            'X-API-KEY': self._api_key,
-            'Content-Type': 'application/json'
-        }
+        payload = b'{"q":' + json.dumps(query).encode() + SERPER_PAYLOAD_SUFFIX
 
-        response = requests.request("POST", url, headers=headers, data=payload)
+        response = self._client.post(SERPER_SEARCH_URL, content=payload)
 
         try:
             res = json.loads(response.text)
         except:
             return "Error: Invalid response from Serper API."
         if "organic" in res:
-            items = res["organic"]
-            results = []
-            for item in items:
-                result = {
+            results: List[SearchHit] = [
+                {
                     "title": item["title"],
                     "url": item["link"],
                     "snippet": item["snippet"],
                     "date": item.get("date", None)
                 }
-                results.append(result)
+                for item in res["organic"]
+            ]
             return {"results": results}
         else:
 
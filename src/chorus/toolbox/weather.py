@@ -3,6 +3,9 @@ import os
 from chorus.data.executable_tool import ExecutableTool
 from chorus.data.executable_tool import SimpleExecutableTool
 from chorus.data.toolschema import ToolSchema
+from chorus.util.http_client import create_requests_session
+
+_SESSION = create_requests_session()
 
 
 @ExecutableTool.register("WeatherCheckingTool")
@@ -36,14 +39,15 @@ class WeatherCheckingTool(SimpleExecutableTool):
         }
         super().__init__(ToolSchema.model_validate(schema))
 
-    def check_weather(self, location: str):
-        import requests
+    def supports_concurrent_execution(self):
+        return True
 
+    def check_weather(self, location: str):
         api_key = os.getenv("OPENWEATHERMAP_API_KEY", None)
         if not api_key:
             return "Error: Please provide your OpenWeatherMap API key in the environment variable OPENWEATHERMAP_API_KEY."
         url = f"http://api.openweathermap.org/data/2.5/weather?q={location}&appid={api_key}"
-        response = requests.get(url)
+        response = _SESSION.get(url)
         if response.status_code == 200:
             data = response.json()
             return data
@@ -1,8 +1,18 @@
-import re
+import threading
 
-from jsonref import requests  # type: ignore
+import lxml.etree
+import lxml.html
+import requests
+from lxml.etree import LxmlError
 from chorus.data.executable_tool import SimpleExecutableTool, ExecutableTool
 from chorus.data.toolschema import ToolSchema
+from chorus.util.http_client import create_requests_session
+from chorus.util.http_client import read_limited
+
+try:
+    from fake_useragent import UserAgent
+except ImportError:
+    UserAgent = None
 
 schema = {
   "tool_name": "WebRetrieverTool",
@@ -29,6 +39,82 @@ schema = {
   ]
 }
 
+# Shared across tool instances so repeated retrievals reuse pooled keep-alive connections
+_SESSION = create_requests_session(
+    headers={
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        # Compressed transfer; br is included when a brotli package is installed
+        'Accept-Encoding': requests.utils.DEFAULT_ACCEPT_ENCODING,
+        'DNT': '1',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1'
+    },
+    pool_connections=32,
+    pool_maxsize=64,
+    retries=2,
+)
+
+# Bytes read from a page before the rest of its body is discarded
+MAX_RESPONSE_BYTES = 2 * 1024 * 1024
+
+# UserAgent loads its browser data on construction, so build it once and share it
+_USER_AGENT = None
+_USER_AGENT_LOCK = threading.Lock()
+
+
+def _random_user_agent():
+    """Returns a random user agent string from the shared UserAgent instance."""
+    global _USER_AGENT
+    if _USER_AGENT is None:
+        with _USER_AGENT_LOCK:
+            if _USER_AGENT is None:
+                _USER_AGENT = UserAgent()
+    return _USER_AGENT.random
+
+
+# Block-level tags directly under <body> that end a line in the extracted text
+_BLOCK_TAGS = frozenset(['p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+
+
+def _html_encoding(content, response):
+    """Picks the encoding to parse a response body with.
+
+    libxml2 falls back to Latin-1 when a page declares no charset, so prefer UTF-8 whenever
+    the body is valid UTF-8, then the charset from the Content-Type header, and otherwise
+    leave it to the page's <meta> declaration.
+    """
+    try:
+        content.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError as e:
+        # A body cut off at the size limit may end partway through a character
+        if e.reason == 'unexpected end of data':
+            return 'utf-8'
+    if 'charset' in response.headers.get('Content-Type', '').lower():
+        return response.encoding
+    return None
+
+
+def _extract_text_with_links(element, depth=0):
+    """Flattens an lxml element into text fragments, rendering links as markdown."""
+    result = []
+    if element.text is not None:
+        result.append(element.text.strip())
+    for child in element:
+        # Comments and processing instructions have a non-string tag; only their tail is text
+        if isinstance(child.tag, str):
+            href = child.get('href')
+            if child.tag == 'a' and href is not None:
+                result.append(f"[{child.text_content().strip()}]({href})")
+            else:
+                result.extend(_extract_text_with_links(child, depth + 1))
+            if depth == 0 and child.tag in _BLOCK_TAGS:
+                result.append('\n')
+        if child.tail is not None:
+            result.append(child.tail.strip())
+    return result
+
 @ExecutableTool.register("WebRetrieverToolV2")
 class WebRetrieverToolV2(SimpleExecutableTool):
     """
@@ -38,58 +124,37 @@ class WebRetrieverToolV2(SimpleExecutableTool):
     def __init__(self):
         super().__init__(ToolSchema.model_validate(schema))
 
+    def supports_concurrent_execution(self):
+        return True
+
     def retrieve(self, url, max_chars=12000):
-        try:
-            from fake_useragent import UserAgent
-            from bs4 import BeautifulSoup, NavigableString, Tag
-        except ImportError:
-            print("Please install the required packages: fake_useragent and beautifulsoup4")
+        if UserAgent is None:
+            print("Please install the required packages: fake_useragent")
             return None
-        # Create a UserAgent object to generate a random user agent string
-        ua = UserAgent()
         headers = {
-            'User-Agent': ua.random,
+            'User-Agent': _random_user_agent(),
             # 'User-Agent': 'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
         }
 
         try:
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            with _SESSION.get(url, headers=headers, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                content = read_limited(response, MAX_RESPONSE_BYTES)
+            try:
+                parser = lxml.html.HTMLParser(encoding=_html_encoding(content, response))
+                tree = lxml.html.document_fromstring(content, parser=parser)
+            except LxmlError:
+                return None
 
             # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-
-            def extract_text_with_links(element, depth=0):
-                result = []
-                for child in element.children:
-                    if isinstance(child, NavigableString):
-                        result.append(child.strip())
-                    elif isinstance(child, Tag):
-                        if child.name == 'a' and child.has_attr('href'):
-                            link_text = child.get_text().strip()
-                            href = child['href']
-                            result.append(f"[{link_text}]({href})")
-                        else:
-                            result.extend(extract_text_with_links(child, depth + 1))
-                        if depth == 0 and child.name in ['p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                            result.append('\n')
-                return result
-
-            if not soup.body:
+            lxml.etree.strip_elements(tree, "script", "style", with_tail=False)
+
+            body = tree.body
+            if body is None:
                 return None
 
-            content = extract_text_with_links(soup.body)
+            content = _extract_text_with_links(body)
             simplified_text = ' '.join(content).replace('\n ', '\n').strip()
-            # Strip <script> and <style> tags
-            simplified_text = re.sub(r'<script.*?>.*?</script>', '', simplified_text, flags=re.DOTALL)
-            simplified_text = re.sub(r'<style.*?>.*?</style>', '', simplified_text, flags=re.DOTALL)
 
             # Truncate to max_chars if needed
             if len(simplified_text) > max_chars:
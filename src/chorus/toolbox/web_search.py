@@ -1,3 +1,6 @@
+import itertools
+import threading
+
 from chorus.data.executable_tool import ExecutableTool
 from chorus.data.executable_tool import SimpleExecutableTool
 from chorus.data.toolschema import ToolSchema
@@ -12,7 +15,13 @@ schema = {
             "description": "Search for a query.",
             "input_schema": {
                 "type": "object",
-                "properties": {"query": {"type": "string", "description": "Search keywords"}},
+                "properties": {
+                    "query": {"type": "string", "description": "Search keywords"},
+                    "max_results": {
+                        "type": "number",
+                        "description": "Maximum number of results, optional.",
+                    },
+                },
                 "required": ["query"],
             },
             "output_schema": {},
@@ -20,6 +29,10 @@ schema = {
     ],
 }
 
+# DDGS clients are reused across searches to keep their connections and cookies. A client is
+# not safe to use from several threads at once, so each thread has its own.
+_DDGS_LOCAL = threading.local()
+
 
 @ExecutableTool.register("DuckDuckGoWebSearchTool")
 class DuckDuckGoWebSearchTool(SimpleExecutableTool):
@@ -30,9 +43,13 @@ class DuckDuckGoWebSearchTool(SimpleExecutableTool):
     def __init__(self):
         super().__init__(ToolSchema.model_validate(schema))
 
-    def search(self, query: str):
+    def search(self, query: str, max_results: int = 10):
         from duckduckgo_search import DDGS
 
-        with DDGS() as ddgs:
-            results = {"results": [r for r in ddgs.text(query)]}
-            return results if results else "No results found."
+        max_results = int(max_results)
+        ddgs = getattr(_DDGS_LOCAL, "ddgs", None)
+        if ddgs is None:
+            ddgs = _DDGS_LOCAL.ddgs = DDGS()
+        # Older DDGS versions page lazily through a generator; stop once enough results are in
+        results = list(itertools.islice(ddgs.text(query, max_results=max_results), max_results))
+        return {"results": results} if results else "No results found."
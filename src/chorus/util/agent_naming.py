@@ -1,4 +1,4 @@
-import uuid
+import os
 
 
 def get_unique_agent_name() -> str:
@@ -8,6 +8,6 @@ def get_unique_agent_name() -> str:
     Returns:
         str: A unique agent name in the format 'agent_<6 hex chars>'
     """
-    # Generate a random UUID and take first 6 characters of its hex representation
-    unique_id = str(uuid.uuid4()).replace('-', '')[:6]
+    # Hex-encode 3 random bytes rather than building a full UUID to keep 6 characters of it
+    unique_id = os.urandom(3).hex()
     return f"agent_{unique_id}"
\ No newline at end of file
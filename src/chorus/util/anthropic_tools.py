@@ -1,46 +1,74 @@
 import re
-from typing import List, Dict, Optional
+import weakref
+from typing import List, Dict, Optional, Tuple
 
 from chorus.data import ToolSchema
 
+# Patterns used to parse function calls out of completions.
+_FC_TAGS_RE = re.compile(r"</?(?:function_calls|invoke|tool_name|parameters)>")
+_FC_BLOCK_RE = re.compile(r"<function_calls>(.*)</function_calls>", re.DOTALL)
+_INVOKE_RE = re.compile(r"<invoke>.*?</invoke>", re.DOTALL)
+_TOOL_NAME_RE = re.compile(r"<tool_name>(.*?)</tool_name>", re.DOTALL)
+_PARAMS_RE = re.compile(r"<parameters>(.*?)</parameters>", re.DOTALL)
+_PARAM_TAG_RE = re.compile(r'<parameter name=".*?">|</parameter>', re.DOTALL)
+_PARAM_PAIR_RE = re.compile(r'<parameter name="(.*?)">(.*?)</parameter>', re.DOTALL)
+_CODE_RE = re.compile(r"```.*?```", re.DOTALL)
+_CODE_PLACEHOLDER_RE = re.compile(r"\x00CB(\d+)\x00")
 
 # This file contains prompt constructors for various pieces of code. Used primarily to keep other code legible.
+_TOOL_USE_PREAMBLE = (
+    "In this environment you have access to a set of tools you can use to answer the user's question.\n"
+    "\n"
+    "You may call them like this:\n"
+    "<function_calls>\n"
+    "<invoke>\n"
+    "<tool_name>$TOOL_NAME</tool_name>\n"
+    "<parameters>\n"
+    "<$PARAMETER_NAME>$PARAMETER_VALUE</$PARAMETER_NAME>\n"
+    "...\n"
+    "</parameters>\n"
+    "</invoke>\n"
+    "</function_calls>\n"
+    "\n"
+    "Here are the tools available:\n"
+    "<tools>\n"
+)
+_TOOL_USE_POSTAMBLE = "\n</tools>"
+
+_TOOL_PROMPT_CACHE: Dict[int, Tuple[weakref.ref, str]] = {}
+
+
+def _format_tool(tool) -> str:
+    key = id(tool)
+    cached = _TOOL_PROMPT_CACHE.get(key)
+    if cached is not None and cached[0]() is tool:
+        return cached[1]
+    prompt = tool.format_tool_for_claude()
+    try:
+        tool_ref = weakref.ref(tool, lambda _, key=key: _TOOL_PROMPT_CACHE.pop(key, None))
+    except TypeError:
+        # Objects that cannot be weakly referenced are formatted on every call
+        return prompt
+    _TOOL_PROMPT_CACHE[key] = (tool_ref, prompt)
+    return prompt
+
+
 def construct_tool_use_system_prompt(tools):
-    tool_use_system_prompt = (
-        "In this environment you have access to a set of tools you can use to answer the user's question.\n"
-        "\n"
-        "You may call them like this:\n"
-        "<function_calls>\n"
-        "<invoke>\n"
-        "<tool_name>$TOOL_NAME</tool_name>\n"
-        "<parameters>\n"
-        "<$PARAMETER_NAME>$PARAMETER_VALUE</$PARAMETER_NAME>\n"
-        "...\n"
-        "</parameters>\n"
-        "</invoke>\n"
-        "</function_calls>\n"
-        "\n"
-        "Here are the tools available:\n"
-        "<tools>\n" + "\n".join([tool.format_tool_for_claude() for tool in tools]) + "\n</tools>"
+    # Tools are formatted once and reused, so only the join runs on every call.
+    return (
+        _TOOL_USE_PREAMBLE + "\n".join([_format_tool(tool) for tool in tools]) + _TOOL_USE_POSTAMBLE
     )
 
-    return tool_use_system_prompt
-
 
 def extract_function_calls(last_completion):
     func_call_prefix_content = None
     # Check if there are any of the relevant XML tags present that would indicate an attempted function call.
-    function_call_tags = re.findall(
-        r"<function_calls>|</function_calls>|<invoke>|</invoke>|<tool_name>|</tool_name>|<parameters>|</parameters>",
-        last_completion,
-        re.DOTALL,
-    )
-    if not function_call_tags:
+    if not _FC_TAGS_RE.search(last_completion):
         # TODO: Should we return something in the text to claude indicating that it did not do anything to indicate an attempted function call (in case it was in fact trying to and we missed it)?
         return {"status": True, "invokes": []}
 
     # Extract content between <function_calls> tags. If there are multiple we will only parse the first and ignore the rest, regardless of their correctness.
-    match = re.search(r"<function_calls>(.*)</function_calls>", last_completion, re.DOTALL)
+    match = _FC_BLOCK_RE.search(last_completion)
     if not match:
         return {
             "status": False,
@@ -48,25 +76,21 @@ def extract_function_calls(last_completion):
         }
 
     func_calls = match.group(1)
-
-    prefix_match = re.search(r"^(.*?)<function_calls>", last_completion, re.DOTALL)
-    if prefix_match:
-        func_call_prefix_content = prefix_match.group(1)
+    # The block match starts at the first <function_calls> tag, so everything before it is the prefix.
+    func_call_prefix_content = last_completion[: match.start()]
 
     # Check for invoke tags
-    # TODO: Is this faster or slower than bundling with the next check?
-    invoke_regex = r"<invoke>.*?</invoke>"
-    if not re.search(invoke_regex, func_calls, re.DOTALL):
+    invoke_strings = _INVOKE_RE.findall(func_calls)
+    if not invoke_strings:
         return {
             "status": False,
             "reason": "Missing <invoke></invoke> tags inside of <function_calls></function_calls> tags.",
         }
 
     # Check each invoke contains tool name and parameters
-    invoke_strings = re.findall(invoke_regex, func_calls, re.DOTALL)
     invokes = []
     for invoke_string in invoke_strings:
-        tool_name = re.findall(r"<tool_name>.*?</tool_name>", invoke_string, re.DOTALL)
+        tool_name = _TOOL_NAME_RE.findall(invoke_string)
         if not tool_name:
             return {
                 "status": False,
@@ -78,7 +102,7 @@ def extract_function_calls(last_completion):
                 "reason": "More than one tool_name specified inside single set of <invoke></invoke> tags.",
             }
 
-        parameters = re.findall(r"<parameters>.*?</parameters>", invoke_string, re.DOTALL)
+        parameters = _PARAMS_RE.findall(invoke_string)
         if not parameters:
             return {
                 "status": False,
@@ -93,45 +117,46 @@ def extract_function_calls(last_completion):
         # Check for balanced tags inside parameters
         # TODO: This will fail if the parameter value contains <> pattern or if there is a parameter called parameters. Fix that issue.
 
-        codes = re.findall(r"```.*?```", parameters[0], re.DOTALL)
-        parameter_block = parameters[0].replace("<parameters>", "").replace("</parameters>", "")
-        for code_i, code in enumerate(codes):
-            parameter_block = parameter_block.replace(code, f"CODE_BLOCK_{code_i}")
+        # Mask code blocks in one pass so tags inside them are not parsed. The placeholders use a
+        # control character so that they cannot collide with real content.
+        codes = []
+
+        def mask_code(code_match):
+            codes.append(code_match.group(0))
+            return f"\x00CB{len(codes) - 1}\x00"
+
+        parameter_block = _CODE_RE.sub(mask_code, parameters[0])
 
-        tags = re.findall(r'<parameter name=".*?">|</parameter>', parameter_block, re.DOTALL)
+        tags = _PARAM_TAG_RE.findall(parameter_block)
         if len(tags) % 2 != 0:
             return {
                 "status": False,
                 "reason": "Imbalanced tags inside <parameters></parameters> tags.",
             }
 
-        # Loop through the tags and check if each even-indexed tag matches the tag in the position after it (with the / of course). If valid store their content for later use.
+        # Check that opening and closing tags alternate, then read every parameter in one pass.
         # TODO: Add a check to make sure there aren't duplicates provided of a given parameter.
+        if any(tag == "</parameter>" for tag in tags[0::2]) or any(
+            tag != "</parameter>" for tag in tags[1::2]
+        ):
+            return {
+                "status": False,
+                "reason": "Non-matching opening and closing tags inside <parameters></parameters> tags.",
+            }
+
         parameters_with_values = []
-        for i in range(0, len(tags), 2):
-            opening_tag = tags[i]
-            closing_tag = tags[i + 1]
-            closing_tag_without_second_char = closing_tag[:1] + closing_tag[2:]
-            if closing_tag[1] != "/" or closing_tag != "</parameter>":
-                return {
-                    "status": False,
-                    "reason": "Non-matching opening and closing tags inside <parameters></parameters> tags.",
-                }
-
-            value_block = re.search(
-                rf"{opening_tag}(.*?){closing_tag}", parameters[0], re.DOTALL
-            ).group(1)
-            for code_i, code in enumerate(codes):
-                value_block = value_block.replace(f"CODE_BLOCK_{code_i}", code)
-
-            parameters_with_values.append(
-                (opening_tag.replace('<parameter name="', "").replace('">', ""), value_block)
-            )
+        for parameter_match in _PARAM_PAIR_RE.finditer(parameter_block):
+            name, value_block = parameter_match.group(1), parameter_match.group(2)
+            if codes:
+                value_block = _CODE_PLACEHOLDER_RE.sub(
+                    lambda m: codes[int(m.group(1))], value_block
+                )
+            parameters_with_values.append((name, value_block))
 
         # Parse out the full function call
         invokes.append(
             {
-                "tool_name": tool_name[0].replace("<tool_name>", "").replace("</tool_name>", ""),
+                "tool_name": tool_name[0],
                 "parameters_with_values": parameters_with_values,
             }
         )
@@ -139,17 +164,35 @@ def extract_function_calls(last_completion):
     return {"status": True, "invokes": invokes, "prefix_content": func_call_prefix_content}
 
 
+# Tool description prompts keyed by id() of their Action, holding a weak reference to the
+# action so that entries are dropped when it is garbage collected and never served for a
+# different object that reuses the id.
+_ACTION_PROMPT_CACHE: Dict[int, Tuple[weakref.ref, str, str]] = {}
+
+
+def _construct_action_prompt(tool_name: str, action) -> str:
+    key = id(action)
+    cached = _ACTION_PROMPT_CACHE.get(key)
+    if cached is not None and cached[0]() is action and cached[1] == tool_name:
+        return cached[2]
+    prompt = construct_format_tool_for_claude_prompt(
+        tool_name + "." + action.name,
+        action.description,
+        action.input_schema.model_dump(exclude_none=True),
+    )
+    action_ref = weakref.ref(action, lambda _, key=key: _ACTION_PROMPT_CACHE.pop(key, None))
+    _ACTION_PROMPT_CACHE[key] = (action_ref, tool_name, prompt)
+    return prompt
+
+
 def construct_schema_prompt_for_chorus_tools(tools: List[ToolSchema]):
-    tool_blocks = []
-    for tool in tools:
-        for action in tool.actions:
-            tool_blocks.append(
-                construct_format_tool_for_claude_prompt(
-                    tool.tool_name + "." + action.name,
-                    action.description,
-                    action.input_schema.model_dump(exclude_none=True),
-                )
-            )
+    # Tool schemas do not change between requests, so each action's description is rendered
+    # once and reused.
+    tool_blocks = [
+        _construct_action_prompt(tool.tool_name, action)
+        for tool in tools
+        for action in tool.actions
+    ]
 
     return "<tools>\n" + "\n".join(tool_blocks) + "\n</tools>"
 
@@ -169,8 +212,10 @@ def construct_successful_function_run_injection_prompt(invoke_results_results):
     constructed_prompt = (
         "<function_results>\n"
         + "\n".join(
-            f"<result>\n<tool_name>{res['tool_name']}</tool_name>\n<stdout>\n{res['tool_result']}\n</stdout>\n</result>"
-            for res in invoke_results_results
+            [
+                f"<result>\n<tool_name>{res['tool_name']}</tool_name>\n<stdout>\n{res['tool_result']}\n</stdout>\n</result>"
+                for res in invoke_results_results
+            ]
         )
         + "\n</function_results>"
     )
@@ -253,36 +298,96 @@ def construct_format_sql_tool_for_claude_prompt(
 def construct_prompt_from_messages(messages):
     validate_messages(messages)
 
-    constructed_prompt = ""
+    parts = []
     for i, message in enumerate(messages):
         if message["role"] == "user":
             if (i > 0 and messages[i - 1]["role"] != "user") or i == 0:
-                constructed_prompt = f"{constructed_prompt}\n\nHuman: {message['content']}"
+                parts.append("\n\nHuman: ")
             else:
-                constructed_prompt = f"{constructed_prompt}\n\n{message['content']}"
+                parts.append("\n\n")
+            parts.append(message["content"])
         if message["role"] == "assistant":
             if (i > 0 and messages[i - 1]["role"] == "user") or i == 0:
-                constructed_prompt = f"{constructed_prompt}\n\nAssistant: {message['content']}"
+                parts.append("\n\nAssistant: ")
             else:
-                constructed_prompt = f"{constructed_prompt}\n\n{message['content']}"
+                parts.append("\n\n")
+            parts.append(message["content"])
         if message["role"] == "tool_inputs":
             appendage = construct_tool_inputs_message(message["content"], message["tool_inputs"])
             if (i > 0 and messages[i - 1]["role"] == "user") or i == 0:
-                constructed_prompt = f"{constructed_prompt}\n\nAssistant:{appendage}"
-            elif message["content"] == "":
-                constructed_prompt = f"{constructed_prompt}{appendage}"
-            else:
-                constructed_prompt = f"{constructed_prompt}\n\n{appendage}"
+                parts.append("\n\nAssistant:")
+            elif message["content"] != "":
+                parts.append("\n\n")
+            parts.append(appendage)
         if message["role"] == "tool_outputs":
             appendage = construct_tool_outputs_message(
                 message["tool_outputs"], message["tool_error"]
             )
             if (i > 0 and messages[i - 1]["role"] == "user") or i == 0:
-                constructed_prompt = f"{constructed_prompt}\n\nAssistant:{appendage}"
-            else:
-                constructed_prompt = f"{constructed_prompt}{appendage}"
+                parts.append("\n\nAssistant:")
+            parts.append(appendage)
 
-    return constructed_prompt
+    return "".join(parts)
+
+
+_TOOL_INPUTS_LIST_ERROR = (
+    "For messages with role='tool_inputs', tool_inputs must be a list of length > 0."
+)
+_TOOL_INPUT_ELEMENT_ERROR = (
+    "All elements of tool_inputs must be dictionaries with keys 'tool_name' and 'tool_arguments'."
+)
+
+
+def _validate_user_or_assistant_message(message):
+    if "content" not in message:
+        raise ValueError("All messages with user or assistant roles must have a 'content' key.")
+    if not isinstance(message["content"], str):
+        raise ValueError(
+            "For messages with role='user' or role='assistant', content must be a string."
+        )
+
+
+def _validate_tool_inputs_message(message):
+    if "tool_inputs" not in message:
+        raise ValueError("All messages with tool_inputs roles must have a 'tool_inputs' key.")
+    tool_inputs = message["tool_inputs"]
+    if not isinstance(tool_inputs, list) or len(tool_inputs) < 1:
+        raise ValueError(_TOOL_INPUTS_LIST_ERROR)
+    for tool_input in tool_inputs:
+        if (
+            not isinstance(tool_input, dict)
+            or "tool_name" not in tool_input
+            or "tool_arguments" not in tool_input
+        ):
+            raise ValueError(_TOOL_INPUT_ELEMENT_ERROR)
+
+
+def _validate_tool_outputs_message(message):
+    if "content" in message:
+        raise ValueError("tool_outputs should not have a 'content' key/value pair")
+    tool_error = message["tool_error"]
+    tool_outputs = message["tool_outputs"]
+    if tool_error is not None and tool_outputs is not None:
+        raise ValueError(
+            "Only one of tool_outputs and tool_error should be provided, the other should be None. Both are currently not None."
+        )
+    if tool_error is None and tool_outputs is None:
+        raise ValueError(
+            "For messages with role='tool_putput' you must provide one of tool_outputs or tool_error."
+        )
+    if tool_outputs is not None and not isinstance(tool_outputs, list):
+        raise ValueError("tool_error must be str or None.")
+    if tool_error is not None and not isinstance(tool_error, str):
+        raise ValueError("tool_error must be str or None.")
+
+
+# Validators for each message role, in the order the roles are listed in error messages
+_MESSAGE_VALIDATORS = {
+    "user": _validate_user_or_assistant_message,
+    "assistant": _validate_user_or_assistant_message,
+    "tool_inputs": _validate_tool_inputs_message,
+    "tool_outputs": _validate_tool_outputs_message,
+}
 
 
 def validate_messages(messages):
@@ -291,81 +396,33 @@ def validate_messages(messages):
     if len(messages) < 1:
         raise ValueError("Messages must be a list of length > 0.")
 
-    valid_roles = ["user", "assistant", "tool_inputs", "tool_outputs"]
     for message in messages:
         if not isinstance(message, dict):
             raise ValueError("All messages in messages list should be dictionaries.")
         if "role" not in message:
             raise ValueError("All messages must have a 'role' key.")
-        if message["role"] not in valid_roles:
+        role = message["role"]
+        validator = _MESSAGE_VALIDATORS.get(role) if isinstance(role, str) else None
+        if validator is None:
             raise ValueError(
-                f"{message['role']} is not a valid role. Valid roles are {valid_roles}"
+                f"{role} is not a valid role. Valid roles are {list(_MESSAGE_VALIDATORS)}"
             )
-        if message["role"] == "user" or message["role"] == "assistant":
-            if "content" not in message:
-                raise ValueError(
-                    "All messages with user or assistant roles must have a 'content' key."
-                )
-            if not isinstance(message["content"], str):
-                raise ValueError(
-                    "For messages with role='user' or role='assistant', content must be a string."
-                )
-        if message["role"] == "tool_inputs":
-            if "tool_inputs" not in message:
-                raise ValueError(
-                    "All messages with tool_inputs roles must have a 'tool_inputs' key."
-                )
-            if not isinstance(message["tool_inputs"], list):
-                raise ValueError(
-                    "For messages with role='tool_inputs', tool_inputs must be a list of length > 0."
-                )
-            if len(message["tool_inputs"]) < 1:
-                raise ValueError(
-                    "For messages with role='tool_inputs', tool_inputs must be a list of length > 0."
-                )
-            for tool_input in message["tool_inputs"]:
-                if not isinstance(tool_input, dict):
-                    raise ValueError(
-                        "All elements of tool_inputs must be dictionaries with keys 'tool_name' and 'tool_arguments'."
-                    )
-                if "tool_name" not in tool_input:
-                    raise ValueError(
-                        "All elements of tool_inputs must be dictionaries with keys 'tool_name' and 'tool_arguments'."
-                    )
-                if "tool_arguments" not in tool_input:
-                    raise ValueError(
-                        "All elements of tool_inputs must be dictionaries with keys 'tool_name' and 'tool_arguments'."
-                    )
-        if message["role"] == "tool_outputs":
-            if "content" in message:
-                raise ValueError("tool_outputs should not have a 'content' key/value pair")
-            if message["tool_error"] is not None and message["tool_outputs"] is not None:
-                raise ValueError(
-                    "Only one of tool_outputs and tool_error should be provided, the other should be None. Both are currently not None."
-                )
-            if message["tool_error"] is None and message["tool_outputs"] is None:
-                raise ValueError(
-                    "For messages with role='tool_putput' you must provide one of tool_outputs or tool_error."
-                )
-            if message["tool_outputs"] is not None and not isinstance(
-                message["tool_outputs"], list
-            ):
-                raise ValueError("tool_error must be str or None.")
-            if message["tool_error"] is not None and not isinstance(message["tool_error"], str):
-                raise ValueError("tool_error must be str or None.")
+        validator(message)
 
 
-def construct_tool_inputs_message(content, tool_inputs):
-    def format_parameters(tool_arguments):
-        return "\n".join([f"<{key}>{value}</{key}>" for key, value in tool_arguments.items()])
+def _format_tool_arguments(tool_arguments):
+    # str.join turns a generator into a list before joining, so a list comprehension is cheaper
+    return "\n".join([f"<{key}>{value}</{key}>" for key, value in tool_arguments.items()])
+
 
+def construct_tool_inputs_message(content, tool_inputs):
     single_call_messages = "\n\n".join(
         [
-            f"<invoke>\n<tool_name>{tool_input['tool_name']}</tool_name>\n<parameters>\n{format_parameters(tool_input['tool_arguments'])}\n</parameters>\n</invoke>"
+            f"<invoke>\n<tool_name>{tool_input['tool_name']}</tool_name>\n<parameters>\n{_format_tool_arguments(tool_input['tool_arguments'])}\n</parameters>\n</invoke>"
             for tool_input in tool_inputs
         ]
     )
-    message = f"{content}" "\n\n<function_calls>\n" f"{single_call_messages}\n" "</function_calls>"
+    message = f"{content}\n\n<function_calls>\n{single_call_messages}\n</function_calls>"
     return message
 
 
@@ -22,6 +22,4 @@ def is_async_observation_data(data: dict):
     """
     Check if the data is an async observation data.
     """
-    if data is None or type(data) != dict:
-        return False
-    return data.get("type", None) == "async_action_calling"
\ No newline at end of file
+    return isinstance(data, dict) and data.get("type") == "async_action_calling"
\ No newline at end of file
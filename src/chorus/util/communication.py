@@ -1,12 +1,31 @@
+from heapq import merge
+from operator import attrgetter
 from typing import List
 from chorus.data.dialog import Message
 from chorus.data.context import AgentContext
 from chorus.data.message_view import MessageView
 from chorus.data.state import AgentState
 
+_timestamp = attrgetter("timestamp")
+
+
+def _sorted_by_timestamp(messages: List[Message]) -> List[Message]:
+    """Returns the messages in timestamp order, only sorting when they are out of order."""
+    if all(messages[i].timestamp <= messages[i + 1].timestamp for i in range(len(messages) - 1)):
+        return messages
+    return sorted(messages, key=_timestamp)
+
+
 def select_message_view(context: AgentContext, state: AgentState, message_history: List[Message]) -> MessageView:
     """Select a message view for the agent.
     """
-    all_messages = message_history + state.internal_events
-    all_messages.sort(key=lambda x: x.timestamp)
+    # Both streams are normally appended in time order, so a linear merge replaces a full sort.
+    # Ties keep history messages ahead of internal events, as the stable sort did.
+    all_messages = list(
+        merge(
+            _sorted_by_timestamp(message_history),
+            _sorted_by_timestamp(state.internal_events),
+            key=_timestamp,
+        )
+    )
     return context.message_view_selector.select(all_messages, message_history[-1])
\ No newline at end of file
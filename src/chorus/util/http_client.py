@@ -0,0 +1,177 @@
+import os
+from contextlib import contextmanager
+from typing import Iterator
+from typing import Optional
+
+
+def http2_enabled() -> bool:
+    """Checks whether toolbox HTTP clients should use HTTP/2.
+
+    HTTP/2 is opt-in through the ``CHORUS_HTTP2`` environment variable and requires the
+    ``httpx[http2]`` package.
+
+    Returns:
+        bool: True if HTTP/2 is enabled.
+    """
+    return os.getenv("CHORUS_HTTP2", "").lower() in ("1", "true", "yes")
+
+
+def create_requests_session(
+    headers: Optional[dict] = None,
+    pool_connections: int = 10,
+    pool_maxsize: int = 20,
+    retries: int = 0,
+):
+    """Creates a requests.Session with a connection-pooling adapter for http and https.
+
+    Args:
+        headers: Default headers sent with every request.
+        pool_connections: Number of per-host connection pools to cache.
+        pool_maxsize: Maximum number of connections kept alive per host.
+        retries: Number of retries on connection errors and 502/503/504 responses.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def read_limited(response, max_bytes: int, chunk_size: int = 64 * 1024) -> bytes:
+    """Reads the body of a streamed requests response, stopping after max_bytes.
+
+    Args:
+        response: A requests response opened with ``stream=True``.
+        max_bytes: Maximum number of bytes to return.
+        chunk_size: Number of bytes to read at a time.
+
+    Returns:
+        bytes: At most max_bytes of the decoded body.
+    """
+    buffer = bytearray()
+    for chunk in response.iter_content(chunk_size):
+        buffer.extend(chunk)
+        if len(buffer) >= max_bytes:
+            break
+    return bytes(buffer[:max_bytes])
+
+
+class StreamedResponse:
+    """A streamed response exposing the httpx ``iter_bytes`` interface over requests.
+
+    Args:
+        response: The underlying requests response opened with ``stream=True``.
+    """
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+
+    def raise_for_status(self):
+        self._response.raise_for_status()
+
+    def iter_bytes(self, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        return self._response.iter_content(chunk_size)
+
+
+class RequestsClient:
+    """Adapts a pooled requests.Session to the subset of the httpx.Client API used by tools.
+
+    Args:
+        timeout: Default timeout in seconds for every request.
+        headers: Default headers sent with every request.
+        max_connections: Maximum number of pooled connections per host.
+    """
+
+    def __init__(
+        self, timeout: float = 10, headers: Optional[dict] = None, max_connections: int = 20
+    ):
+        self._session = create_requests_session(headers=headers, pool_maxsize=max_connections)
+        self._timeout = timeout
+
+    @property
+    def headers(self):
+        return self._session.headers
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        content: Optional[bytes] = None,
+        follow_redirects: bool = True,
+        **kwargs,
+    ):
+        kwargs.setdefault("timeout", self._timeout)
+        return self._session.request(
+            method, url, data=content, allow_redirects=follow_redirects, **kwargs
+        )
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    @contextmanager
+    def stream(self, method: str, url: str, **kwargs) -> Iterator[StreamedResponse]:
+        response = self.request(method, url, stream=True, **kwargs)
+        try:
+            yield StreamedResponse(response)
+        finally:
+            response.close()
+
+    def close(self):
+        self._session.close()
+
+
+def create_http_client(timeout: float = 10, headers: Optional[dict] = None):
+    """Creates a pooled HTTP client for toolbox tools.
+
+    Returns an ``httpx.Client`` multiplexing requests over HTTP/2 when ``CHORUS_HTTP2`` is
+    set, and otherwise a ``RequestsClient`` exposing the same calling convention.
+
+    Args:
+        timeout: Default timeout in seconds for every request.
+        headers: Default headers sent with every request.
+
+    Returns:
+        An ``httpx.Client`` or ``RequestsClient``.
+
+    Raises:
+        ValueError: If HTTP/2 is enabled but httpx is not installed.
+    """
+    if http2_enabled():
+        try:
+            import httpx
+        except ImportError:
+            raise ValueError("Error: Please install httpx[http2] package to enable CHORUS_HTTP2.")
+        return httpx.Client(
+            http2=True,
+            timeout=timeout,
+            headers=headers,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+        )
+    return RequestsClient(timeout=timeout, headers=headers)
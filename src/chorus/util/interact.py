@@ -1,20 +1,24 @@
 import json
 import logging
-import re
-from typing import Callable
+import os
+import sys
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict
+from typing import FrozenSet
 from typing import List
 from typing import Optional
-from typing import Type
+from typing import Tuple
 
 from chorus.data.data_types import ActionData, ObservationData
 from chorus.data.context import AgentContext
 from chorus.data.state import AgentState
 from chorus.data.dialog import Message
 from chorus.data.dialog import EventType
-from chorus.data.planner_output import PlannerOutput
 from chorus.data.prompt import StructuredPrompt
 from chorus.data.context import AsyncExecutionRecord
-from chorus.data.state import PassiveAgentState
 from chorus.executors import SimpleToolExecutor
 from chorus.lms import LanguageModelClient
 from chorus.planners.base import MultiAgentPlanner
@@ -22,23 +26,96 @@ from chorus.prompters import InteractPrompter
 from chorus.util.async_actions import is_async_observation_data
 from chorus.util.logging import chorus_logging_option
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of actions of one message executed concurrently
+MAX_CONCURRENT_ACTIONS = 8
+
+# Worker threads for concurrent actions, shared by every orchestration turn in this process
+_ACTION_POOL: Optional[ThreadPoolExecutor] = None
+_ACTION_POOL_PID: Optional[int] = None
+_ACTION_POOL_LOCK = threading.Lock()
+
+
+def _get_action_pool() -> ThreadPoolExecutor:
+    global _ACTION_POOL, _ACTION_POOL_PID
+    # Agents run in forked processes, which do not inherit the parent's worker threads
+    if _ACTION_POOL is None or _ACTION_POOL_PID != os.getpid():
+        with _ACTION_POOL_LOCK:
+            if _ACTION_POOL is None or _ACTION_POOL_PID != os.getpid():
+                _ACTION_POOL = ThreadPoolExecutor(
+                    max_workers=MAX_CONCURRENT_ACTIONS, thread_name_prefix="chorus-action"
+                )
+                _ACTION_POOL_PID = os.getpid()
+    return _ACTION_POOL
+
+
+def _dumps_pretty(obj) -> str:
+    # orjson is a C extension and serializes large prompts several times faster than json
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+        except TypeError:
+            # Values orjson rejects (e.g. non-string keys) fall back to the standard library
+            pass
+    return json.dumps(obj, indent=2)
+
+
+# Numeric parameter keys of each input schema, keyed by id() and evicted when the schema is freed
+_NUMERIC_PARAM_KEYS_CACHE: Dict[int, Tuple[weakref.ref, FrozenSet[str]]] = {}
+
+
+def _numeric_param_keys(input_schema) -> FrozenSet[str]:
+    key = id(input_schema)
+    cached = _NUMERIC_PARAM_KEYS_CACHE.get(key)
+    if cached is not None and cached[0]() is input_schema:
+        return cached[1]
+    properties = input_schema.model_dump().get("properties", {})
+    numeric_keys = frozenset(
+        parameter_key
+        for parameter_key, parameter_schema in properties.items()
+        if parameter_schema["data_type"] in ("number", "integer")
+    )
+    schema_ref = weakref.ref(input_schema, lambda _, key=key: _NUMERIC_PARAM_KEYS_CACHE.pop(key, None))
+    _NUMERIC_PARAM_KEYS_CACHE[key] = (schema_ref, numeric_keys)
+    return numeric_keys
+
 
 def fix_action_param_type(tool_action_map: dict, action: ActionData):
-    action_schema = tool_action_map.get((action.tool_name, action.action_name), None)
+    tool_actions = tool_action_map.get(action.tool_name)
+    action_schema = tool_actions.get(action.action_name) if tool_actions is not None else None
     if action_schema is None:
         return action
-    input_schema = action_schema.input_schema.model_dump()
-    for parameter_key, parameter_schema in input_schema.get("properties", {}).items():
-        if parameter_key in action.parameters and parameter_schema["data_type"] in (
-            "number",
-            "integer",
-        ):
-            action.parameters[parameter_key] = int(action.parameters[parameter_key])
+    # Input schemas do not change, so their numeric parameters are only looked up once
+    numeric_keys = _numeric_param_keys(action_schema.input_schema)
+    if not numeric_keys:
+        # Most actions only take strings, so there is nothing to convert
+        return action
+    for parameter_key in numeric_keys & action.parameters.keys():
+        action.parameters[parameter_key] = int(action.parameters[parameter_key])
     return action
 
 
+def _log_prompt(agent_id: str, prompt, llm_response):
+    # Serializing a long prompt costs more than the rest of the turn's bookkeeping, so skip it
+    # entirely unless INFO records are actually emitted.
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    logger.info("==== PROMPT inside %s ====", agent_id)
+    if isinstance(prompt, StructuredPrompt):
+        logger.info(_dumps_pretty(prompt.to_dict()))
+    else:
+        logger.info(str(prompt))
+    logger.info("--->")
+    logger.info(llm_response)
+    logger.info("==== *** ====")
+
+
 def orchestrate_generate_turns(
     context: AgentContext,
     state: AgentState,
@@ -50,7 +127,7 @@ def orchestrate_generate_turns(
     agent_instruction = context.get_agent_instruction()
     reference_datetime = context.get_current_datetime()
     resources = context.get_resources()
-    tool_schemas = [tool.get_schema() for tool in context.get_tools()]
+    tool_schemas = context.get_tool_schemas()
 
     # Call planner
     if planner is not None:
@@ -77,23 +154,9 @@ def orchestrate_generate_turns(
     try:
         llm_response = lm.generate(prompt)
     except Exception as e:
-        logger.info(f"==== PROMPT inside {context.agent_id} ====")
-        if isinstance(prompt, StructuredPrompt):
-            logger.info(json.dumps(prompt.to_dict(), indent=2))
-        else:
-            logger.info(str(prompt))
-        logger.info("--->")
-        logger.info("ERROR")
-        logger.info("==== *** ====")
+        _log_prompt(context.agent_id, prompt, "ERROR")
         raise e
-    logger.info(f"==== PROMPT inside {context.agent_id} ====")
-    if isinstance(prompt, StructuredPrompt):
-        logger.info(json.dumps(prompt.to_dict(), indent=2))
-    else:
-        logger.info(str(prompt))
-    logger.info("--->")
-    logger.info(llm_response)
-    logger.info("==== *** ====")
+    _log_prompt(context.agent_id, prompt, llm_response)
 
     output_turns = prompter.parse_generation(llm_response)
     if not output_turns:
@@ -104,6 +167,21 @@ def orchestrate_generate_turns(
     return output_turns
 
 
+def _print_action(agent_id: str, action: ActionData):
+    # One write per action instead of one per line
+    sys.stdout.write(
+        f"   ╰─>\033[1m[ACTION] {agent_id} triggered {action.tool_name}.{action.action_name} with following parameters:\033[0m\n"
+        f"      {action.parameters}\n"
+    )
+
+
+def _execute_action(executor: SimpleToolExecutor, action: ActionData):
+    try:
+        return executor.execute(action)
+    except Exception as e:
+        return {"error": str(e)}
+
+
 def orchestrate_generate_next_actions(
     context: AgentContext,
     state: AgentState,
@@ -156,69 +234,78 @@ def orchestrate_execute_actions(
     if not action_message.actions:
         return None
     
-    # Create a mapping of tool actions for easy lookup
-    tool_action_map = {}
-    for tool in context.get_tools():
-        schema = tool.get_schema()
-        for action in schema.actions:
-            tool_action_map[(schema.tool_name, action.name)] = action
-    
-    # Extract actions from the last message
-    actions = action_message.extract_actions()
-    
+    # Mapping of tool actions for easy lookup, cached on the context across turns
+    tool_action_map = context.get_tool_action_map()
+
+    # Extract actions from the last message and fix their parameter types
+    actions = [
+        fix_action_param_type(tool_action_map, action)
+        for action in action_message.extract_actions()
+    ]
+
+    # Logging options do not change while the actions of one message are executed
+    log_actions = chorus_logging_option("action")
+
     observations = []
-    for action in actions:
-        # Fix parameter types for the action
-        action = fix_action_param_type(tool_action_map, action)
-        
-        # Log action details if action logging is enabled
-        if chorus_logging_option("action"):
-            logger.info(f"\033[1m[ACTION] {context.agent_id}\033[0m")
-            logger.info(f"Tool: {action.tool_name}, Action: {action.action_name}, Parameters: {action.parameters}")
-        
-        # Print non-agent actions to console for visibility
-        if not action.tool_name.startswith("agent_") and action.action_name != "send_message":
-            print(f"   ╰─>\033[1m[ACTION] {context.agent_id} triggered {action.tool_name}.{action.action_name} with following parameters:\033[0m")
-            print(f"      {action.parameters}")
-        
-        # Execute the action using the tool executor
-        try:
-            observation = executor.execute(action)
-        except Exception as e:
-            import traceback
-            observation = {"error": str(e)}
-        
-        # Log observation if action logging is enabled
-        if chorus_logging_option("action"):
-            logger.info(f"\033[1m[OBSERVATION] {context.agent_id}\033[0m")
-            logger.info(observation)
-        
-        # Special handling for asynchronous actions
-        if is_async_observation_data(observation):
-            # Extract and validate async execution ID
-            async_execution_id = observation.get("async_execution_id", None)
-            assert async_execution_id is not None
-            
-            # Store execution record in the async cache
-            async_cache = context.get_async_execution_cache()
-            async_cache[async_execution_id] = AsyncExecutionRecord(
-                action_source=action_message.source,
-                action_channel=action_message.channel,
-                tool_use_id=action.tool_use_id
-            )
-            
-            # Create observation message for the async action
-            observation_turn = Message(
-                event_type=EventType.INTERNAL_EVENT, 
-                observations=[ObservationData(data=observation, tool_use_id=action.tool_use_id)],
-                source=context.agent_id,
-                destination=context.agent_id
+    batch_start = 0
+    while batch_start < len(actions):
+        # Consecutive actions whose tools opt in to concurrent execution are run together on a
+        # thread pool; every other action runs on its own, in order.
+        batch_end = batch_start + 1
+        if executor.supports_concurrent_execution(actions[batch_start]):
+            while batch_end < len(actions) and executor.supports_concurrent_execution(
+                actions[batch_end]
+            ):
+                batch_end += 1
+        batch = actions[batch_start:batch_end]
+        batch_start = batch_end
+
+        for action in batch:
+            # Log action details if action logging is enabled
+            if log_actions:
+                logger.info(f"\033[1m[ACTION] {context.agent_id}\033[0m")
+                logger.info(f"Tool: {action.tool_name}, Action: {action.action_name}, Parameters: {action.parameters}")
+
+            # Print non-agent actions to console for visibility
+            if not action.tool_name.startswith("agent_") and action.action_name != "send_message":
+                _print_action(context.agent_id, action)
+
+        # Execute the actions using the tool executor
+        if len(batch) > 1:
+            batch_observations = list(
+                _get_action_pool().map(partial(_execute_action, executor), batch)
             )
-            # Return early for async actions
-            return observation_turn
+        else:
+            batch_observations = [_execute_action(executor, batch[0])]
+
+        # An asynchronous action stops the actions after it from running. The other actions of
+        # its batch have already run, so their observations are kept along with its own.
+        has_async_observation = False
+        for action, observation in zip(batch, batch_observations):
+            # Log observation if action logging is enabled
+            if log_actions:
+                logger.info(f"\033[1m[OBSERVATION] {context.agent_id}\033[0m")
+                logger.info(observation)
+
+            # Special handling for asynchronous actions
+            if is_async_observation_data(observation):
+                # Extract and validate async execution ID
+                async_execution_id = observation.get("async_execution_id", None)
+                assert async_execution_id is not None
+
+                # Store execution record in the async cache
+                async_cache = context.get_async_execution_cache()
+                async_cache[async_execution_id] = AsyncExecutionRecord(
+                    action_source=action_message.source,
+                    action_channel=action_message.channel,
+                    tool_use_id=action.tool_use_id
+                )
+                has_async_observation = True
+
+            observations.append(ObservationData(data=observation, tool_use_id=action.tool_use_id))
 
-        # Add observation to the list for synchronous actions
-        observations.append(ObservationData(data=observation, tool_use_id=action.tool_use_id))
+        if has_async_observation:
+            break
 
     # Create a single message containing all observations
     observation_turn = Message(
@@ -1,6 +1,15 @@
+import functools
 import os
+from typing import FrozenSet
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_logging_options(logging_option: str) -> FrozenSet[str]:
+    return frozenset(logging_option.lower().split(","))
+
 
 def chorus_logging_option(key: str) -> bool:
-    logging_option = os.getenv("CHORUS_LOGGING", "").lower()
-    logging_options = logging_option.split(",")
-    return key in logging_options or "all" in logging_options
\ No newline at end of file
+    # The environment is still read on every call so that changes take effect, but each
+    # distinct value is only parsed once.
+    logging_options = _parse_logging_options(os.getenv("CHORUS_LOGGING", ""))
+    return key in logging_options or "all" in logging_options
@@ -1,8 +1,37 @@
+import copy
+import functools
 import os
 from typing import Any, Dict, Optional
 
 import yaml
 
+try:
+    # libyaml-backed loader, several times faster than the pure-Python SafeLoader
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+
+@functools.lru_cache(maxsize=64)
+def _load_config(config_path: str, mtime: float) -> Any:
+    """Parses a prompter config file, caching the result until the file is modified."""
+    with open(config_path) as f:
+        return yaml.load(f, Loader=_SafeLoader)
+
+
+# Base prompter class for each prompter type. chorus.prompters imports this module, so the
+# classes are looked up once on first use rather than at import time.
+_PROMPTER_BASE_CLASSES: Dict[str, type] = {}
+
+
+def _get_prompter_base_class(prompter_type: str) -> Optional[type]:
+    if not _PROMPTER_BASE_CLASSES:
+        from chorus.prompters import InteractPrompter
+        from chorus.prompters import PromptAdapter
+
+        _PROMPTER_BASE_CLASSES.update({"interact": InteractPrompter, "adapter": PromptAdapter})
+    return _PROMPTER_BASE_CLASSES.get(prompter_type)
+
 
 class PrompterUtil:
     """Utility class for creating prompters.
@@ -39,22 +68,18 @@ class PrompterUtil:
         if config_path is not None:
             if not os.path.exists(config_path):
                 raise FileNotFoundError(f"Prompter config does not exist:\n{config_path}")
-            with open(config_path) as f:
-                config = yaml.safe_load(f)
+            # Configs are shared by every agent built from them, so parse each file once and
+            # hand out copies that callers are free to modify
+            config = copy.deepcopy(_load_config(config_path, os.path.getmtime(config_path)))
             if "prompter" not in config:
                 raise ValueError(
                     f"Prompter config file must have 'prompter' field to specify prompter name."
                 )
-            prompter_name = config["prompter"]
-            del config["prompter"]
+            prompter_name = config.pop("prompter")
             kwargs = config
         # Create base prompter class
-        if prompter_type == "interact":
-            from chorus.prompters import InteractPrompter
-            prompter_class = InteractPrompter.get_subclass(prompter_name)
-        elif prompter_type == "adapter":
-            from chorus.prompters import PromptAdapter
-            prompter_class = PromptAdapter.get_subclass(prompter_name)
-        else:
+        base_class = _get_prompter_base_class(prompter_type)
+        if base_class is None:
             raise NotImplementedError
+        prompter_class = base_class.get_subclass(prompter_name)
         return prompter_class(**kwargs)
@@ -1,8 +1,8 @@
+import sys
 import time
 import logging
-from typing import Dict, List, Optional, Tuple, Union
-
-from pydantic import BaseModel
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 from chorus.data.agent_status import AgentStatus
 from chorus.communication.message_service import ChorusMessageRouter
@@ -10,33 +10,69 @@ from chorus.communication.zmq_protocol import MessageType, ZMQMessage
 
 logger = logging.getLogger(__name__)
 
-class MultiAgentStatusManager(BaseModel):
+# Number of most recent status records kept by default
+DEFAULT_MAX_STATUS_RECORDS = 10000
+
+class MultiAgentStatusManager:
     """Manages status tracking for agents using ZMQ for communication.
     
     Provides functionality for tracking and updating the status of various
     components in the system using ZMQ-based communication.
     """
+
+    __slots__ = ("_message_router", "_status_records", "_latest_status")
+
+    _message_router: Optional[ChorusMessageRouter]
+    _status_records: Deque[Tuple[int, str, AgentStatus]]  # [(timestamp, agent_id, status)]
+    _latest_status: Dict[str, AgentStatus]  # {agent_id: status}
+
+    # record_plan does not record anything yet; callers on hot paths can check this first
+    plan_recording_enabled = False
     
-    def __init__(self, message_router: Optional[ChorusMessageRouter] = None):
+    def __init__(
+        self,
+        message_router: Optional[ChorusMessageRouter] = None,
+        max_records: int = DEFAULT_MAX_STATUS_RECORDS,
+    ):
         """Initialize the status manager.
         
         Args:
             message_router: The ZMQ message router to use for communication
+            max_records: Number of most recent status records to keep; older ones are dropped
             proc_manager: Legacy parameter for compatibility, not used in ZMQ implementation
         """
-        super().__init__()
         self._message_router = message_router
-        self._status_records = []  # [(timestamp, agent_id, status)]
+        self._status_records = deque(maxlen=max_records)
+        self._latest_status = {}
         
-    def record(self, agent_id: str, status: AgentStatus):
+    def record(self, agent_id: str, status: AgentStatus, now: Optional[int] = None):
         """Record an agent status event.
         
         Args:
             agent_id: ID of the agent
             status: Status to record
+            now: Timestamp of the event in seconds; the current time is used if not given
         """
-        timestamp = int(time.time())
+        timestamp = int(time.time()) if now is None else now
+        # Records of the same agent then share one string object instead of a copy each
+        agent_id = sys.intern(agent_id)
         self._status_records.append((timestamp, agent_id, status))
+        self._latest_status[agent_id] = status
+
+    def record_batch(self, updates: List[Tuple[str, AgentStatus]], now: Optional[int] = None):
+        """Record several agent status events that happened at the same time.
+        
+        The clock is read at most once and the history grows once for the whole batch,
+        e.g. when snapshotting every agent's status at the end of a tick.
+        
+        Args:
+            updates: List of (agent_id, status) pairs, in the order they happened
+            now: Timestamp of the events in seconds; the current time is used if not given
+        """
+        timestamp = int(time.time()) if now is None else now
+        records = [(timestamp, sys.intern(agent_id), status) for agent_id, status in updates]
+        self._status_records.extend(records)
+        self._latest_status.update((agent_id, status) for _, agent_id, status in records)
         
     def record_plan(
         self,
@@ -47,6 +83,8 @@ class MultiAgentStatusManager(BaseModel):
     ):
         """Record a plan execution event.
         
+        This is currently a no-op, see plan_recording_enabled.
+        
         Args:
             agent_id: ID of the agent
             plan: The current plan
@@ -56,23 +94,34 @@ class MultiAgentStatusManager(BaseModel):
         # This could be enhanced to send plan information over ZMQ
         pass
     
-    def get_records(self) -> List[Tuple[int, str, AgentStatus]]:
-        """Get all status records.
+    def get_records(self) -> Sequence[Tuple[int, str, AgentStatus]]:
+        """Get the most recent status records.
         
         Returns:
-            List of (timestamp, agent_id, status) tuples
+            Sequence of (timestamp, agent_id, status) tuples, oldest first
         """
         return self._status_records
+
+    def iter_records(self) -> Iterator[Tuple[int, str, AgentStatus]]:
+        """Iterate over the most recent status records without copying them.
+        
+        Recording a status while the iterator is in use invalidates it, so take a
+        snapshot with list(get_records()) if records may be added concurrently.
+        
+        Returns:
+            Iterator of (timestamp, agent_id, status) tuples, oldest first
+        """
+        return iter(self._status_records)
     
-    def update_status(self, entity_id: str, status: AgentStatus):
+    def update_status(self, entity_id: str, status: AgentStatus, now: Optional[int] = None):
         """Update the status of an entity.
         
         Args:
             entity_id: ID of the entity to update
             status: New status to set
+            now: Timestamp of the update in seconds; the current time is used if not given
         """
-        timestamp = int(time.time())
-        self._status_records.append((timestamp, entity_id, status))
+        self.record(entity_id, status, now=now)
         
     def get_status(self, entity_id: str) -> Optional[AgentStatus]:
         """Get the current status of an entity.
@@ -83,7 +132,4 @@ class MultiAgentStatusManager(BaseModel):
         Returns:
             Current status of the entity, or None if not found
         """
-        for timestamp, agent_id, status in reversed(self._status_records):
-            if agent_id == entity_id:
-                return status
-        return None
+        return self._latest_status.get(entity_id)
@@ -1,6 +1,7 @@
 from chorus.communication.message_service import ChorusMessageClient
-import uuid
-from typing import Dict, List, Optional, Set
+from collections import defaultdict
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Set
 from chorus.data.dialog import Message
 
 
@@ -16,8 +17,13 @@ class MockMessageClient(ChorusMessageClient):
         self.agent_id = agent_id
         self._message_history = []
         self._local_message_ids = set()
+        # Messages indexed by each field filter_messages can match on
+        self._by_source: Dict[str, List[Message]] = defaultdict(list)
+        self._by_destination: Dict[str, List[Message]] = defaultdict(list)
+        self._by_channel: Dict[str, List[Message]] = defaultdict(list)
         self._team_info = None
         self._running = True
+        self._next_id = 0
     
     def _register(self):
         """Mock registration - no actual ZMQ connection."""
@@ -31,6 +37,12 @@ class MockMessageClient(ChorusMessageClient):
         """Stop the mock client."""
         self._running = False
     
+    def _new_message_id(self) -> str:
+        """Generate a message ID unique within this client without reading random bytes."""
+        message_id = f"{self.agent_id}-{self._next_id}"
+        self._next_id += 1
+        return message_id
+    
     def send_message(self, message: Message):
         """Store a message in the local history.
         
@@ -38,12 +50,17 @@ class MockMessageClient(ChorusMessageClient):
             message: Message to store
         """
         if message.message_id is None:
-            message.message_id = str(uuid.uuid4().hex)
+            # A freshly generated ID cannot have been seen yet, so skip the duplicate check
+            message.message_id = self._new_message_id()
+        elif message.message_id in self._local_message_ids:
+            return
             
         # Add to local message history
-        if message.message_id not in self._local_message_ids:
-            self._message_history.append(message)
-            self._local_message_ids.add(message.message_id)
+        self._message_history.append(message)
+        self._local_message_ids.add(message.message_id)
+        self._by_source[message.source].append(message)
+        self._by_destination[message.destination].append(message)
+        self._by_channel[message.channel].append(message)
     
     def fetch_all_messages(self) -> List[Message]:
         """Fetch all messages in the local message history.
@@ -65,12 +82,41 @@ class MockMessageClient(ChorusMessageClient):
         Returns:
             List of filtered messages
         """
-        return [
-            msg for msg in self._message_history
-            if (source is None or msg.source == source)
-            and (destination is None or msg.destination == destination)
-            and (channel is None or msg.channel == channel)
-        ]
+        return list(self._select_messages(source, destination, channel))
+    
+    def _select_messages(self, source: Optional[str], destination: Optional[str],
+                         channel: Optional[str]) -> Iterable[Message]:
+        """Lazily select the messages matching all of the given criteria.
+        
+        Candidates come from the shortest per-field index that applies, and only the
+        criteria that index does not already guarantee are checked on each message.
+        
+        Returns:
+            Matching messages in history order
+        """
+        candidates = self._message_history
+        indexed_field = None
+        criteria = []
+        for field, index, value in (
+            ("source", self._by_source, source),
+            ("destination", self._by_destination, destination),
+            ("channel", self._by_channel, channel),
+        ):
+            if value is not None:
+                criteria.append((field, value))
+                # get() so that lookups of unseen values do not grow the index
+                matches = index.get(value, [])
+                if len(matches) < len(candidates):
+                    candidates = matches
+                    indexed_field = field
+
+        remaining = [(field, value) for field, value in criteria if field != indexed_field]
+        if not remaining:
+            return candidates
+        # A single attrgetter call and comparison per message, whichever criteria are given
+        get_fields = attrgetter(*(field for field, _ in remaining))
+        expected = remaining[0][1] if len(remaining) == 1 else tuple(v for _, v in remaining)
+        return filter(lambda msg: get_fields(msg) == expected, candidates)
     
     def send_state_update(self, state_dict: Dict):
         """Mock state update - no actual sending occurs."""
@@ -93,8 +139,7 @@ class MockMessageClient(ChorusMessageClient):
         Returns:
             First matching message or None if none found
         """
-        messages = self.filter_messages(source=source, destination=destination, channel=channel)
-        return messages[0] if messages else None
+        return next(iter(self._select_messages(source, destination, channel)), None)
     
     def send_messages(self, messages: List[Message]):
         """Store multiple messages in the local history.
@@ -102,8 +147,21 @@ class MockMessageClient(ChorusMessageClient):
         Args:
             messages: List of messages to store
         """
+        new_messages = []
         for message in messages:
-            self.send_message(message)
+            if message.message_id is None:
+                message.message_id = self._new_message_id()
+            # Also skips repeats within the batch itself
+            elif message.message_id in self._local_message_ids:
+                continue
+            self._local_message_ids.add(message.message_id)
+            new_messages.append(message)
+
+        self._message_history.extend(new_messages)
+        for message in new_messages:
+            self._by_source[message.source].append(message)
+            self._by_destination[message.destination].append(message)
+            self._by_channel[message.channel].append(message)
     
     def get_team_info(self) -> Optional[Dict]:
         """Get the mock team info.
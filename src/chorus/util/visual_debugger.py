@@ -1,20 +1,66 @@
-from flask import Flask, render_template_string, jsonify
+from flask import Flask, Response, request
+from collections import defaultdict, deque
+import jinja2
+import gzip
+import hashlib
 import os
 import threading
 import webbrowser
-from typing import Dict, Optional, List
+from typing import Deque, Dict, Optional, List
 import time
 import logging
 import json
 from chorus.data.state import TeamState
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from waitress import serve
+except ImportError:
+    serve = None
+
+
+def _parse_message(line) -> Optional[Dict]:
+    """Parse a messages log line, returning None unless it holds a well-formed message."""
+    try:
+        msg = orjson.loads(line) if orjson is not None else json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(msg, dict) or "source" not in msg or "destination" not in msg or "content" not in msg:
+        return None
+    return msg
+
+
+def _is_global_message(msg: Dict) -> bool:
+    """Whether a logged message belongs in the Global Messages panel."""
+    # Excludes self-messages and messages with actions/observations
+    return msg['source'] != msg['destination'] and not msg.get('actions') and not msg.get('observations')
+
+
+# Seconds between checks for new data while update streams are open
+UPDATE_INTERVAL_SECONDS = 2
+# Seconds an idle update stream waits before sending a keep-alive comment, so that streams of
+# closed pages notice the disconnect and free their thread
+KEEPALIVE_INTERVAL_SECONDS = 15
+# JSON responses at least this large are gzipped for clients that accept it; smaller ones
+# are not worth the CPU or the extra header bytes
+COMPRESS_MIN_BYTES = 1024
+# Fast gzip level; logged JSON compresses well even at low levels
+COMPRESS_LEVEL = 4
+# Most recent messages kept for the panels; older ones are dropped from pages loaded later
+MAX_MESSAGES = 10000
+# Worker threads when served by waitress; every open page holds one for its update stream
+SERVER_THREADS = 32
+
 
 VISUAL_TEMPLATE = '''
 <!DOCTYPE html>
 <html>
 <head>
     <title>Chorus Visual Debugger</title>
-    <script src="https://code.jquery.com/jquery-3.6.0.min.js"></script>
     <style>
         body { 
             font-family: Arial, sans-serif;
@@ -124,6 +170,10 @@ VISUAL_TEMPLATE = '''
             overflow-y: auto;
             height: 100%;
         }
+        .panel, .messages {
+            /* Scrolling is kept steady by hand when messages above the view are added or removed */
+            overflow-anchor: none;
+        }
         .messages {
             border-left: 1px solid #eee;
             padding-left: 15px;
@@ -165,6 +215,9 @@ VISUAL_TEMPLATE = '''
             padding: 8px;
             margin-top: 4px;
         }
+        .scrollable-content summary {
+            cursor: pointer;
+        }
         .message-content {
             max-height: 200px;
             overflow-y: auto;
@@ -371,6 +424,10 @@ VISUAL_TEMPLATE = '''
             font-size: 14px;
             line-height: 1.5;
         }
+        .scratchpad-viewport {
+            max-height: 70vh;
+            overflow-y: auto;
+        }
         .author-column {
             color: #666;
             font-size: 12px;
@@ -434,49 +491,145 @@ VISUAL_TEMPLATE = '''
         }
     </style>
     <script>
+        // Elements used across handlers, looked up once the page is loaded
+        const els = {};
+
+        function cacheElements() {
+            els.side = document.getElementById('side-by-side');
+            els.tab = document.getElementById('tab-view');
+            els.tabButtons = document.getElementById('tab-buttons');
+            els.scratchpadView = document.getElementById('scratchpad-view');
+            els.scratchpadContent = document.getElementById('scratchpadContent');
+            els.viewToggle = document.getElementById('view-toggle');
+            els.teamInfo = document.getElementById('teamInfo');
+            els.teamInfoContent = document.getElementById('teamInfoContent');
+            els.teamInfoOverlay = document.getElementById('teamInfoOverlay');
+        }
+
+        // Scroll positions of all panels are kept under one key, as each storage call is synchronous.
+        // As only a window of messages is rendered, a messages scroll position is kept as an anchor:
+        // the log index of the first visible message and its offset from the top of the scroll area
+        const SCROLL_POSITIONS_KEY = 'scrollPositions';
+
+        function scrollAreaTop(scroller) {
+            return scroller === document.scrollingElement ? 0 : scroller.getBoundingClientRect().top;
+        }
+
+        function messagesAnchor(messagesDiv) {
+            // None is needed while the newest messages are scrolled to the bottom, as they are shown anyway
+            const view = messageViews.get(messagesDiv);
+            if (!view || view.start === view.end) {
+                return null;
+            }
+            const scroller = scrollContainer(messagesDiv);
+            if (view.end === view.messages.length
+                && scroller.scrollHeight - scroller.scrollTop === scroller.clientHeight) {
+                return null;
+            }
+            const top = scrollAreaTop(scroller);
+            let element = view.top.nextElementSibling;
+            for (let i = view.start; i < view.end; i++, element = element.nextElementSibling) {
+                const rect = element.getBoundingClientRect();
+                if (rect.bottom > top) {
+                    return {index: view.messages[i].log_index, offset: rect.top - top};
+                }
+            }
+            return null;
+        }
+
         function saveScrollPositions() {
-            // Save panel scroll positions
+            const positions = {panels: {}, anchors: {}};
             document.querySelectorAll('.panel').forEach(panel => {
                 const agentId = panel.querySelector('h2').textContent;
-                localStorage.setItem(`panel_scroll_${agentId}`, panel.scrollTop);
+                positions.panels[agentId] = panel.scrollTop;
                 
-                // Save message section scroll positions
+                // Save the message section anchor
                 const messagesDiv = panel.querySelector('.messages');
-                if (messagesDiv) {
-                    localStorage.setItem(`messages_scroll_${agentId}`, messagesDiv.scrollTop);
+                const anchor = messagesDiv && messagesAnchor(messagesDiv);
+                if (anchor && !positions.anchors[agentId]) {
+                    positions.anchors[agentId] = anchor;
                 }
             });
+            localStorage.setItem(SCROLL_POSITIONS_KEY, JSON.stringify(positions));
         }
 
+        // Message anchors read on load, restored once the first update renders the messages
+        let pendingMessagesAnchors = null;
+
         function restoreScrollPositions() {
+            let positions;
+            try {
+                positions = JSON.parse(localStorage.getItem(SCROLL_POSITIONS_KEY)) || {};
+            } catch (error) {
+                positions = {};
+            }
+            const panelPositions = positions.panels || {};
+            pendingMessagesAnchors = positions.anchors || {};
             document.querySelectorAll('.panel').forEach(panel => {
                 const agentId = panel.querySelector('h2').textContent;
-                const savedPanelScroll = localStorage.getItem(`panel_scroll_${agentId}`);
-                if (savedPanelScroll) {
-                    panel.scrollTop = savedPanelScroll;
+                if (panelPositions[agentId]) {
+                    panel.scrollTop = panelPositions[agentId];
                 }
-                
+            });
+        }
+
+        function showMessagesAnchor(messagesDiv, anchor) {
+            // Render the window around the anchored message and scroll it back to where it was
+            const view = messageViews.get(messagesDiv);
+            if (!view) {
+                return;
+            }
+            // Messages are in log order, so search for the anchored one, or the next one still kept
+            let index = 0;
+            let high = view.messages.length;
+            while (index < high) {
+                const mid = (index + high) >> 1;
+                if (view.messages[mid].log_index < anchor.index) {
+                    index = mid + 1;
+                } else {
+                    high = mid;
+                }
+            }
+            if (index === view.messages.length) {
+                return;
+            }
+            if (index < view.start || index >= view.end) {
+                const start = Math.max(0, Math.min(index - MESSAGE_WINDOW_STEP, view.messages.length - MESSAGE_WINDOW));
+                removeRendered(view, true, view.end - view.start);
+                view.start = view.end = start;
+                appendMessages(view, Math.min(view.messages.length, start + MESSAGE_WINDOW));
+            }
+            let element = view.top.nextElementSibling;
+            for (let i = view.start; i < index; i++) {
+                element = element.nextElementSibling;
+            }
+            const scroller = scrollContainer(messagesDiv);
+            scroller.scrollTop += element.getBoundingClientRect().top - scrollAreaTop(scroller) - anchor.offset;
+        }
+
+        function restoreMessagesAnchors() {
+            const anchors = pendingMessagesAnchors;
+            pendingMessagesAnchors = null;
+            document.querySelectorAll('.panel').forEach(panel => {
+                const agentId = panel.querySelector('h2').textContent;
                 const messagesDiv = panel.querySelector('.messages');
-                if (messagesDiv) {
-                    const savedMessagesScroll = localStorage.getItem(`messages_scroll_${agentId}`);
-                    if (savedMessagesScroll) {
-                        messagesDiv.scrollTop = savedMessagesScroll;
-                    }
+                if (messagesDiv && anchors[agentId]) {
+                    showMessagesAnchor(messagesDiv, anchors[agentId]);
                 }
             });
         }
 
-        // Save positions before refresh
         window.addEventListener('beforeunload', saveScrollPositions);
         
         // Restore positions after page load
         document.addEventListener('DOMContentLoaded', () => {
+            cacheElements();
             restoreScrollPositions();
             initializeView();
         });
 
         function refreshPage() {
-            fetchUpdates();
+            connectUpdates();
         }
 
         function initializeView() {
@@ -484,15 +637,10 @@ VISUAL_TEMPLATE = '''
             const lastActiveTab = localStorage.getItem('activeTab');
             
             if (viewMode === 'tab') {
-                const sideView = document.getElementById('side-by-side');
-                const tabView = document.getElementById('tab-view');
-                const tabButtons = document.getElementById('tab-buttons');
-                const toggleBtn = document.getElementById('view-toggle');
-                
-                sideView.style.display = 'none';
-                tabView.style.display = 'block';
-                tabButtons.style.display = 'block';
-                toggleBtn.textContent = 'Switch to Side by Side';
+                els.side.style.display = 'none';
+                els.tab.style.display = 'block';
+                els.tabButtons.style.display = 'block';
+                els.viewToggle.textContent = 'Switch to Side by Side';
                 
                 const tabToShow = lastActiveTab || document.querySelector('.tab-btn').getAttribute('data-agent');
                 showTab(tabToShow);
@@ -500,25 +648,23 @@ VISUAL_TEMPLATE = '''
         }
 
         function toggleView() {
-            const sideView = document.getElementById('side-by-side');
-            const tabView = document.getElementById('tab-view');
-            const tabButtons = document.getElementById('tab-buttons');
-            const scratchpadView = document.getElementById('scratchpad-view');
-            const toggleBtn = document.getElementById('view-toggle');
-            
-            scratchpadView.style.display = 'none';
+            if (els.scratchpadView.style.display === 'block') {
+                els.scratchpadView.style.display = 'none';
+                // Stop streaming scratchpad changes
+                connectUpdates();
+            }
             
-            if (sideView.style.display === 'none') {
-                sideView.style.display = 'grid';
-                tabView.style.display = 'none';
-                tabButtons.style.display = 'none';
-                toggleBtn.textContent = 'Switch to Tab View';
+            if (els.side.style.display === 'none') {
+                els.side.style.display = 'grid';
+                els.tab.style.display = 'none';
+                els.tabButtons.style.display = 'none';
+                els.viewToggle.textContent = 'Switch to Tab View';
                 localStorage.setItem('viewMode', 'side');
             } else {
-                sideView.style.display = 'none';
-                tabView.style.display = 'block';
-                tabButtons.style.display = 'block';
-                toggleBtn.textContent = 'Switch to Side by Side';
+                els.side.style.display = 'none';
+                els.tab.style.display = 'block';
+                els.tabButtons.style.display = 'block';
+                els.viewToggle.textContent = 'Switch to Side by Side';
                 localStorage.setItem('viewMode', 'tab');
                 const lastActiveTab = localStorage.getItem('activeTab');
                 const tabToShow = lastActiveTab || document.querySelector('.tab-btn').getAttribute('data-agent');
@@ -544,290 +690,504 @@ VISUAL_TEMPLATE = '''
             localStorage.setItem('activeTab', agentId);
         }
 
-        let lastMessageCounts = {};
+        // Sequence number of the last update applied; the first update brings every message
+        let lastSeq = 0;
+        let updateStream = null;
+        // Sequence number of the last update applied to the scratchpads
+        let scratchpadSeq = 0;
+        // Panels by agent id, filled in once the page is loaded
+        const panelsByAgent = new Map();
 
-        function initializeMessageCounts() {
-            document.querySelectorAll('.panel').forEach(panel => {
-                const agentId = panel.querySelector('h2').textContent;
-                const messages = panel.querySelectorAll('.message');
-                lastMessageCounts[agentId] = messages.length;
-            });
+        // Most messages rendered at once in a panel, and how many more to render when
+        // scrolling reaches either end of the rendered ones
+        const MESSAGE_WINDOW = 200;
+        const MESSAGE_WINDOW_STEP = 50;
+
+        // Per messages element, all of its messages and the range [start, end) rendered
+        const messageViews = new WeakMap();
+
+        // Skeleton of a rendered message, cloned for each message
+        const messageTemplate = document.createElement('template');
+        messageTemplate.innerHTML = '<div class="message"><div class="message-header"></div>'
+            + '<div class="message-content"></div>'
+            + '<details class="scrollable-content"><summary>[Actions]</summary><pre></pre></details>'
+            + '<details class="scrollable-content"><summary>[Observations]</summary><pre></pre></details></div>';
+
+        // Pretty-printed actions and observations, as messages are rendered again when scrolled back to
+        const prettyJsonCache = new WeakMap();
+
+        function prettyJson(value) {
+            if (value === null || typeof value !== 'object') {
+                return JSON.stringify(value, null, 2);
+            }
+            let text = prettyJsonCache.get(value);
+            if (text === undefined) {
+                text = JSON.stringify(value, null, 2);
+                prettyJsonCache.set(value, text);
+            }
+            return text;
+        }
+
+        // Most actions and observations are never expanded, so they are only printed when opened
+        function showJsonOnExpand(details, value) {
+            details.addEventListener('toggle', () => {
+                details.lastElementChild.textContent = prettyJson(value);
+            }, { once: true });
         }
 
         function createMessageElement(msg, agentId) {
-            const messageDiv = document.createElement('div');
-            messageDiv.className = `message ${msg.source === agentId ? 'sent' : 'received'}`;
+            const messageDiv = messageTemplate.content.firstElementChild.cloneNode(true);
+            messageDiv.classList.add(msg.source === agentId ? 'sent' : 'received');
+            const [headerDiv, contentDiv, actionsDetails, obsDetails] = messageDiv.children;
             
-            const headerDiv = document.createElement('div');
-            headerDiv.className = 'message-header';
             headerDiv.textContent = `${msg.source} -> ${msg.destination}${msg.channel ? ` (${msg.channel})` : ''}:`;
-            messageDiv.appendChild(headerDiv);
             
             if (msg.content) {
-                const contentDiv = document.createElement('div');
-                contentDiv.className = 'message-content';
                 contentDiv.textContent = msg.content;
-                messageDiv.appendChild(contentDiv);
+            } else {
+                contentDiv.remove();
             }
             
             if (msg.actions) {
-                const actionsDiv = document.createElement('div');
-                actionsDiv.className = 'scrollable-content';
-                const actionsPre = document.createElement('pre');
-                actionsPre.textContent = `[Actions]\n${JSON.stringify(msg.actions, null, 2)}`;
-                actionsDiv.appendChild(actionsPre);
-                messageDiv.appendChild(actionsDiv);
+                showJsonOnExpand(actionsDetails, msg.actions);
+            } else {
+                actionsDetails.remove();
             }
             
             if (msg.observations) {
-                const obsDiv = document.createElement('div');
-                obsDiv.className = 'scrollable-content';
-                const obsPre = document.createElement('pre');
-                obsPre.textContent = `[Observations]\n${JSON.stringify(msg.observations, null, 2)}`;
-                obsDiv.appendChild(obsPre);
-                messageDiv.appendChild(obsDiv);
+                showJsonOnExpand(obsDetails, msg.observations);
+            } else {
+                obsDetails.remove();
             }
             
             return messageDiv;
         }
 
+        function scrollContainer(element) {
+            // The nearest element that currently scrolls its content
+            for (let node = element; node; node = node.parentElement) {
+                const overflowY = getComputedStyle(node).overflowY;
+                if ((overflowY === 'auto' || overflowY === 'scroll') && node.scrollHeight > node.clientHeight) {
+                    return node;
+                }
+            }
+            return document.scrollingElement;
+        }
+
+        function getMessageView(messagesDiv, agentId) {
+            let view = messageViews.get(messagesDiv);
+            if (view) {
+                return view;
+            }
+            view = {agentId, messages: [], start: 0, end: 0};
+            // Sentinels around the rendered messages load more when scrolled into view
+            view.top = document.createElement('div');
+            view.bottom = document.createElement('div');
+            messagesDiv.append(view.top, view.bottom);
+            view.observer = new IntersectionObserver(entries => {
+                for (const entry of entries) {
+                    if (!entry.isIntersecting) {
+                        continue;
+                    }
+                    if (entry.target === view.top && view.start > 0) {
+                        prependMessages(view, Math.max(0, view.start - MESSAGE_WINDOW_STEP));
+                    } else if (entry.target === view.bottom && view.end < view.messages.length) {
+                        appendMessages(view, Math.min(view.messages.length, view.end + MESSAGE_WINDOW_STEP));
+                    } else {
+                        continue;
+                    }
+                    // Observing again reports the sentinel afresh in case it is still in view
+                    view.observer.unobserve(entry.target);
+                    view.observer.observe(entry.target);
+                }
+            });
+            view.observer.observe(view.top);
+            view.observer.observe(view.bottom);
+            messageViews.set(messagesDiv, view);
+            return view;
+        }
+
+        function removeRendered(view, fromTop, count) {
+            // Removing messages above the visible ones would shift them, so scroll back by as much
+            const scroller = scrollContainer(view.top);
+            const heightBefore = scroller.scrollHeight;
+            for (let i = 0; i < count; i++) {
+                (fromTop ? view.top.nextElementSibling : view.bottom.previousElementSibling).remove();
+            }
+            if (fromTop) {
+                scroller.scrollTop -= heightBefore - scroller.scrollHeight;
+                view.start += count;
+            } else {
+                view.end -= count;
+            }
+        }
+
+        function appendMessages(view, newEnd) {
+            // Render messages [view.end, newEnd) below the rendered ones
+            if (newEnd - view.end >= MESSAGE_WINDOW) {
+                // None of the rendered messages would stay, so skip straight to the last window
+                removeRendered(view, true, view.end - view.start);
+                view.start = view.end = newEnd - MESSAGE_WINDOW;
+            }
+            // Insert through a fragment so the panel is laid out once for the whole batch
+            const fragment = document.createDocumentFragment();
+            for (let i = view.end; i < newEnd; i++) {
+                fragment.appendChild(createMessageElement(view.messages[i], view.agentId));
+            }
+            view.bottom.before(fragment);
+            view.end = newEnd;
+            if (view.end - view.start > MESSAGE_WINDOW) {
+                removeRendered(view, true, view.end - view.start - MESSAGE_WINDOW);
+            }
+        }
+
+        function prependMessages(view, newStart) {
+            // Render messages [newStart, view.start) above the rendered ones, keeping them in place
+            const scroller = scrollContainer(view.top);
+            const heightBefore = scroller.scrollHeight;
+            const fragment = document.createDocumentFragment();
+            for (let i = newStart; i < view.start; i++) {
+                fragment.appendChild(createMessageElement(view.messages[i], view.agentId));
+            }
+            view.top.after(fragment);
+            scroller.scrollTop += scroller.scrollHeight - heightBefore;
+            view.start = newStart;
+            if (view.end - view.start > MESSAGE_WINDOW) {
+                removeRendered(view, false, view.end - view.start - MESSAGE_WINDOW);
+            }
+        }
+
         function updatePanelContent(panel, newContent, newMessages) {
             const agentId = panel.querySelector('h2').textContent;
             
-            // Update output content if it exists
+            // Update output content if it changed
             const outputDiv = panel.querySelector('.output');
-            if (outputDiv && newContent) {
+            if (outputDiv && newContent !== undefined) {
                 outputDiv.querySelector('pre').textContent = newContent;
             }
             
-            // Update messages
+            // Add the new messages, rendering them only if the newest messages are on screen
             const messagesDiv = panel.querySelector('.messages');
-            if (messagesDiv && newMessages) {
-                const currentCount = lastMessageCounts[agentId] || 0;
-                const newCount = newMessages.length;
+            if (messagesDiv && newMessages && newMessages.length > 0) {
+                const view = getMessageView(messagesDiv, agentId);
+                const scroller = scrollContainer(messagesDiv);
+                const wasAtBottom = scroller.scrollHeight - scroller.scrollTop === scroller.clientHeight;
+                const showingNewest = view.end === view.messages.length;
                 
-                if (newCount > currentCount) {
-                    // Append only new messages
-                    const wasAtBottom = messagesDiv.scrollHeight - messagesDiv.scrollTop === messagesDiv.clientHeight;
-                    
-                    for (let i = currentCount; i < newCount; i++) {
-                        const messageElement = createMessageElement(newMessages[i], agentId);
-                        messagesDiv.appendChild(messageElement);
-                    }
-                    
-                    // Auto-scroll if was at bottom
-                    if (wasAtBottom) {
-                        messagesDiv.scrollTop = messagesDiv.scrollHeight;
-                    }
-                    
-                    lastMessageCounts[agentId] = newCount;
+                for (const msg of newMessages) {
+                    view.messages.push(msg);
+                }
+                if (showingNewest) {
+                    appendMessages(view, view.messages.length);
+                }
+                
+                // Auto-scroll if was at bottom
+                if (wasAtBottom) {
+                    scroller.scrollTop = scroller.scrollHeight;
                 }
             }
         }
 
-        async function fetchUpdates() {
-            try {
-                const response = await fetch('/updates');
-                const data = await response.json();
-                
-                // Update panels
-                data.panels.forEach(panelData => {
-                    const panel = $(`h2:contains("${panelData.agent_id}")`).closest('.panel')[0];
-                    if (panel) {
-                        updatePanelContent(panel, panelData.content, panelData.messages);
-                    }
+        function applyUpdates(data) {
+            // Scratchpad changes come with updates while the scratchpads are shown
+            if (data.scratchpads) {
+                applyScratchpadUpdates(data.scratchpads);
+                scratchpadSeq = Math.max(scratchpadSeq, data.seq);
+            }
+
+            // Each update holds what changed since the previous one, so skip any already applied
+            if (data.seq <= lastSeq) {
+                return;
+            }
+            lastSeq = data.seq;
+
+            // Update panels
+            data.panels.forEach(panelData => {
+                (panelsByAgent.get(panelData.agent_id) || []).forEach(panel => {
+                    updatePanelContent(panel, panelData.content, panelData.messages);
                 });
+            });
 
-                // Update scratchpad view if it's visible
-                const scratchpadView = document.getElementById('scratchpad-view');
-                if (scratchpadView && scratchpadView.style.display === 'block') {
-                    fetchScratchpads();
-                }
-            } catch (error) {
-                console.error('Error fetching updates:', error);
+            // Messages are only rendered by the first update, so their anchors are restored after it
+            if (pendingMessagesAnchors) {
+                restoreMessagesAnchors();
             }
         }
 
-        // Initialize message counts and start update loop
+        function connectUpdates() {
+            // A new stream resumes after the last applied update, so a reconnect sends it at once
+            if (updateStream) {
+                updateStream.close();
+            }
+            let url = `/events?since=${lastSeq}`;
+            if (els.scratchpadView.style.display === 'block') {
+                url += `&scratchpads_since=${scratchpadSeq}`;
+            }
+            updateStream = new EventSource(url);
+            updateStream.onmessage = event => applyUpdates(JSON.parse(event.data));
+        }
+
+        // Subscribe to updates once the page is ready
         document.addEventListener('DOMContentLoaded', () => {
-            initializeMessageCounts();
             initializeView();
+
+            // Each agent has a panel in both the side by side and the tab view
+            document.querySelectorAll('.panel').forEach(panel => {
+                const agentId = panel.querySelector('h2').textContent;
+                if (!panelsByAgent.has(agentId)) {
+                    panelsByAgent.set(agentId, []);
+                }
+                panelsByAgent.get(agentId).push(panel);
+            });
             
-            // Auto fetch updates every 2 seconds
-            setInterval(fetchUpdates, 2000);
+            // The server only sends updates when the panels change, and EventSource
+            // reconnects by itself if the connection drops
+            connectUpdates();
         });
 
-        // Add contains selector for case-insensitive text matching
-        jQuery.expr[':'].contains = function(a, i, m) {
-            return jQuery(a).text().toUpperCase()
-                .indexOf(m[3].toUpperCase()) >= 0;
-        };
+        // Hidden pages drop their update stream, freeing its server thread, and catch up
+        // on what they missed once shown again
+        document.addEventListener('visibilitychange', () => {
+            if (document.hidden) {
+                if (updateStream) {
+                    updateStream.close();
+                    updateStream = null;
+                }
+            } else if (!updateStream) {
+                connectUpdates();
+            }
+        });
 
-        async function showTeamInfo() {
-            try {
-                const response = await fetch('/team_info');
-                const data = await response.json();
-                let content = '';
-                
-                // Display Teams
-                content += '<h3 class="section-title">Teams</h3>';
-                data.teams.forEach(team => {
-                    content += `<div class="team-section">`;
-                    content += `<div class="subsection-title">Team: ${team.name}</div>`;
-                    
-                    // Show collaboration info
-                    if (typeof team.collaboration === 'object') {
-                        content += `<div><span class="info-label">Collaboration:</span>`;
-                        content += `<span class="info-value">${team.collaboration.type}</span>`;
-                        if (team.collaboration.coordinator) {
-                            content += `<br><span class="info-label">Coordinator:</span>`;
-                            content += `<span class="info-value">${team.collaboration.coordinator}</span>`;
-                        }
-                        content += `</div>`;
-                    } else {
-                        content += `<div><span class="info-label">Collaboration:</span>`;
-                        content += `<span class="info-value">${team.collaboration}</span></div>`;
+        // Creates an element with a class and text, followed by any children
+        function createNode(tag, className, text, ...children) {
+            const node = document.createElement(tag);
+            if (className) {
+                node.className = className;
+            }
+            if (text !== undefined) {
+                node.textContent = text;
+            }
+            node.append(...children);
+            return node;
+        }
+
+        function createInfoRow(label, value) {
+            return createNode('div', '', undefined,
+                createNode('span', 'info-label', label),
+                createNode('span', 'info-value', value));
+        }
+
+        function createLabel(label) {
+            return createNode('div', '', undefined, createNode('span', 'info-label', label));
+        }
+
+        function createTriggerSection(trigger) {
+            const section = createNode('div', 'trigger-section', undefined,
+                createNode('div', 'trigger-title', trigger.type));
+
+            // Display conditions in a grid
+            const conditions = createNode('div', 'trigger-conditions');
+            Object.entries(trigger.conditions).forEach(([key, value]) => {
+                conditions.appendChild(createNode('div', 'trigger-condition', undefined,
+                    createNode('div', 'trigger-condition-key', `${key}:`),
+                    createNode('div', 'trigger-condition-value', String(value))));
+            });
+            section.append(createLabel('Conditions:'), conditions);
+
+            // Display context in a structured way
+            const context = createNode('div', 'context-section');
+            if (trigger.context.instruction) {
+                context.append(createLabel('Instruction:'),
+                    createNode('div', 'context-instruction', trigger.context.instruction));
+            }
+            if (trigger.context.tools && trigger.context.tools.length > 0) {
+                context.append(createLabel('Tools:'), createNode('div', 'context-tools', undefined,
+                    ...trigger.context.tools.map(tool => createNode('span', 'context-tool', tool))));
+            }
+            section.append(createLabel('Context:'), context);
+            return section;
+        }
+
+        function createAgentSection(agent) {
+            const section = createNode('div', 'agent-section', undefined,
+                createInfoRow('Name:', agent.name),
+                createInfoRow('Type:', agent.type));
+
+            if (agent.instruction) {
+                section.append(createLabel('Instruction:'), createNode('div', 'code-block', agent.instruction));
+            }
+
+            if (agent.tools && agent.tools.length > 0) {
+                section.append(createLabel('Tools:'), createNode('ul', 'tools-list', undefined,
+                    ...agent.tools.map(tool => createNode('li', '', tool))));
+            }
+
+            if (agent.triggers && agent.triggers.length > 0) {
+                section.appendChild(createNode('div', 'subsection-title', 'Triggers:'));
+                agent.triggers.forEach(trigger => section.appendChild(createTriggerSection(trigger)));
+            }
+            return section;
+        }
+
+        function createTeamInfo(data) {
+            const fragment = document.createDocumentFragment();
+
+            // Display Teams
+            fragment.appendChild(createNode('h3', 'section-title', 'Teams'));
+            data.teams.forEach(team => {
+                const section = createNode('div', 'team-section', undefined,
+                    createNode('div', 'subsection-title', `Team: ${team.name}`));
+
+                // Show collaboration info
+                if (team.collaboration && typeof team.collaboration === 'object') {
+                    const collaboration = createInfoRow('Collaboration:', team.collaboration.type);
+                    if (team.collaboration.coordinator) {
+                        collaboration.append(document.createElement('br'),
+                            createNode('span', 'info-label', 'Coordinator:'),
+                            createNode('span', 'info-value', team.collaboration.coordinator));
                     }
-                    
-                    // Show agents
-                    content += `<div class="subsection-title">Agents:</div>`;
-                    team.agents.forEach(agent => {
-                        content += `<div class="agent-section">`;
-                        content += `<div><span class="info-label">Name:</span>`;
-                        content += `<span class="info-value">${agent.name}</span></div>`;
-                        content += `<div><span class="info-label">Type:</span>`;
-                        content += `<span class="info-value">${agent.type}</span></div>`;
-                        
-                        if (agent.instruction) {
-                            content += `<div><span class="info-label">Instruction:</span></div>`;
-                            content += `<div class="code-block">${agent.instruction}</div>`;
-                        }
-                        
-                        if (agent.tools && agent.tools.length > 0) {
-                            content += `<div><span class="info-label">Tools:</span></div>`;
-                            content += `<ul class="tools-list">`;
-                            agent.tools.forEach(tool => {
-                                content += `<li>${tool}</li>`;
-                            });
-                            content += `</ul>`;
-                        }
-                        
-                        if (agent.triggers && agent.triggers.length > 0) {
-                            content += `<div class="subsection-title">Triggers:</div>`;
-                            agent.triggers.forEach(trigger => {
-                                content += `<div class="trigger-section">`;
-                                content += `<div class="trigger-title">${trigger.type}</div>`;
-                                
-                                // Display conditions in a grid
-                                content += `<div><span class="info-label">Conditions:</span></div>`;
-                                content += `<div class="trigger-conditions">`;
-                                Object.entries(trigger.conditions).forEach(([key, value]) => {
-                                    content += `<div class="trigger-condition">`;
-                                    content += `<div class="trigger-condition-key">${key}:</div>`;
-                                    content += `<div class="trigger-condition-value">${value}</div>`;
-                                    content += `</div>`;
-                                });
-                                content += `</div>`;
-                                
-                                // Display context in a structured way
-                                content += `<div><span class="info-label">Context:</span></div>`;
-                                content += `<div class="context-section">`;
-                                if (trigger.context.instruction) {
-                                    content += `<div><span class="info-label">Instruction:</span></div>`;
-                                    content += `<div class="context-instruction">${trigger.context.instruction}</div>`;
-                                }
-                                if (trigger.context.tools && trigger.context.tools.length > 0) {
-                                    content += `<div><span class="info-label">Tools:</span></div>`;
-                                    content += `<div class="context-tools">`;
-                                    trigger.context.tools.forEach(tool => {
-                                        content += `<span class="context-tool">${tool}</span>`;
-                                    });
-                                    content += `</div>`;
-                                }
-                                content += `</div>`;
-                                
-                                content += `</div>`;
-                            });
-                        }
-                        
-                        content += `</div>`;
-                    });
-                    content += `</div>`;
+                    section.appendChild(collaboration);
+                } else {
+                    section.appendChild(createInfoRow('Collaboration:', String(team.collaboration)));
+                }
+
+                // Show agents
+                section.appendChild(createNode('div', 'subsection-title', 'Agents:'));
+                team.agents.forEach(agent => section.appendChild(createAgentSection(agent)));
+                fragment.appendChild(section);
+            });
+
+            // Display Channels
+            if (data.channels.length > 0) {
+                fragment.appendChild(createNode('h3', 'section-title', 'Channels'));
+                data.channels.forEach(channel => {
+                    fragment.appendChild(createNode('div', 'channel-section', undefined,
+                        createInfoRow('Name:', channel.name),
+                        createInfoRow('Members:', channel.members.join(', '))));
                 });
-                
-                // Display Channels
-                if (data.channels.length > 0) {
-                    content += '<h3 class="section-title">Channels</h3>';
-                    data.channels.forEach(channel => {
-                        content += `<div class="channel-section">`;
-                        content += `<div><span class="info-label">Name:</span>`;
-                        content += `<span class="info-value">${channel.name}</span></div>`;
-                        content += `<div><span class="info-label">Members:</span>`;
-                        content += `<span class="info-value">${channel.members.join(', ')}</span></div>`;
-                        content += `</div>`;
-                    });
+            }
+            return fragment;
+        }
+
+        // Team settings do not change while the page is open, so they are only rendered once
+        let teamInfoRendered = false;
+
+        async function showTeamInfo() {
+            try {
+                if (!teamInfoRendered) {
+                    const response = await fetch('/team_info');
+                    const data = await response.json();
+                    els.teamInfoContent.replaceChildren(createTeamInfo(data));
+                    teamInfoRendered = true;
                 }
-                
-                document.getElementById('teamInfoContent').innerHTML = content;
-                document.getElementById('teamInfoOverlay').style.display = 'block';
-                document.getElementById('teamInfo').style.display = 'block';
+                els.teamInfoOverlay.style.display = 'block';
+                els.teamInfo.style.display = 'block';
             } catch (error) {
                 console.error('Error fetching team info:', error);
             }
         }
 
         function hideTeamInfo() {
-            document.getElementById('teamInfoOverlay').style.display = 'none';
-            document.getElementById('teamInfo').style.display = 'none';
+            els.teamInfoOverlay.style.display = 'none';
+            els.teamInfo.style.display = 'none';
         }
 
         function showScratchpadTab() {
             // Hide all other views
-            document.getElementById('side-by-side').style.display = 'none';
-            document.getElementById('tab-view').style.display = 'none';
-            document.getElementById('tab-buttons').style.display = 'none';
-            document.getElementById('scratchpad-view').style.display = 'block';
+            els.side.style.display = 'none';
+            els.tab.style.display = 'none';
+            els.tabButtons.style.display = 'none';
+            els.scratchpadView.style.display = 'block';
             
-            // Fetch and display scratchpads
-            fetchScratchpads();
-        }
-
-        function fetchScratchpads() {
-            fetch('/scratchpads')
-                .then(response => response.json())
-                .then(data => {
-                    let content = '';
-                    data.scratchpads.forEach(scratchpad => {
-                        content += `<div class="scratchpad-card">`;
-                        content += `<div class="scratchpad-title">${scratchpad.id}</div>`;
-                        content += `<div class="scratchpad-content">`;
-                        
-                        // Author column
-                        content += `<div class="author-column">`;
-                        let lastAuthor = null;
-                        scratchpad.lines.forEach((line, index) => {
-                            content += `<div class="author-cell">`;
-                            if (line.last_modified_by !== lastAuthor) {
-                                content += `by ${line.last_modified_by}`;
-                                lastAuthor = line.last_modified_by;
-                            }
-                            content += `</div>`;
-                        });
-                        content += `</div>`;
-                        
-                        // Content column
-                        content += `<div class="content-column">`;
-                        scratchpad.lines.forEach((line, index) => {
-                            content += `<div class="content-cell">`;
-                            content += line.content;
-                            content += `</div>`;
-                        });
-                        content += `</div>`;
-                        
-                        content += `</div></div>`;
-                    });
-                    document.getElementById('scratchpadContent').innerHTML = content;
-                });
+            // Reconnect to also stream the scratchpad changes since they were last shown
+            connectUpdates();
+        }
+
+        // Height of a scratchpad line, as set on .author-cell and .content-cell
+        const SCRATCHPAD_LINE_HEIGHT = 21;
+        // Lines rendered above and below the visible ones
+        const SCRATCHPAD_OVERSCAN = 20;
+        // Cards by scratchpad id, kept across updates so that they keep their scroll position
+        const scratchpadCards = new Map();
+
+        function createScratchpadCard(id) {
+            const card = document.createElement('div');
+            card.className = 'scratchpad-card';
+            const title = document.createElement('div');
+            title.className = 'scratchpad-title';
+            title.textContent = id;
+
+            // The spacer is as tall as all lines, while only the rendered ones are in the columns
+            const viewport = document.createElement('div');
+            viewport.className = 'scratchpad-viewport';
+            const spacer = document.createElement('div');
+            const content = document.createElement('div');
+            content.className = 'scratchpad-content';
+            const authors = document.createElement('div');
+            authors.className = 'author-column';
+            const texts = document.createElement('div');
+            texts.className = 'content-column';
+            content.append(authors, texts);
+            spacer.appendChild(content);
+            viewport.appendChild(spacer);
+            card.append(title, viewport);
+
+            card.scratchpad = {lines: [], viewport, spacer, content, authors, texts};
+            viewport.addEventListener('scroll', () => renderScratchpadLines(card.scratchpad));
+            return card;
+        }
+
+        function renderScratchpadLines(scratchpad) {
+            const {lines, viewport} = scratchpad;
+            const first = Math.max(0, Math.floor(viewport.scrollTop / SCRATCHPAD_LINE_HEIGHT) - SCRATCHPAD_OVERSCAN);
+            const last = Math.min(
+                lines.length,
+                Math.ceil((viewport.scrollTop + viewport.clientHeight) / SCRATCHPAD_LINE_HEIGHT) + SCRATCHPAD_OVERSCAN
+            );
+
+            const authorCells = [];
+            const contentCells = [];
+            for (let i = first; i < last; i++) {
+                const authorCell = document.createElement('div');
+                authorCell.className = 'author-cell';
+                // Only show the author where it differs from the line above
+                if (i === 0 || lines[i].last_modified_by !== lines[i - 1].last_modified_by) {
+                    authorCell.textContent = `by ${lines[i].last_modified_by}`;
+                }
+                authorCells.push(authorCell);
+
+                const contentCell = document.createElement('div');
+                contentCell.className = 'content-cell';
+                contentCell.textContent = lines[i].content;
+                contentCells.push(contentCell);
+            }
+            scratchpad.content.style.transform = `translateY(${first * SCRATCHPAD_LINE_HEIGHT}px)`;
+            scratchpad.authors.replaceChildren(...authorCells);
+            scratchpad.texts.replaceChildren(...contentCells);
+        }
+
+        function applyScratchpadUpdates(scratchpads) {
+            // Each scratchpad update holds the lines from the first changed one on
+            scratchpads.forEach(update => {
+                let card = scratchpadCards.get(update.id);
+                if (update.removed) {
+                    if (card) {
+                        card.remove();
+                        scratchpadCards.delete(update.id);
+                    }
+                    return;
+                }
+                if (!card) {
+                    card = createScratchpadCard(update.id);
+                    scratchpadCards.set(update.id, card);
+                    els.scratchpadContent.appendChild(card);
+                }
+                const lines = card.scratchpad.lines;
+                lines.length = update.start;
+                update.lines.forEach(line => lines.push(line));
+                card.scratchpad.spacer.style.height = `${lines.length * SCRATCHPAD_LINE_HEIGHT}px`;
+                renderScratchpadLines(card.scratchpad);
+            });
         }
     </script>
 </head>
@@ -867,49 +1227,8 @@ VISUAL_TEMPLATE = '''
                         <pre>{{ panel.content }}</pre>
                     </div>
                     {% endif %}
-                    <div class="messages {% if panel.agent_id == 'Global Messages' %}global-messages{% endif %}">
-                        {% for msg in panel.messages %}
-                            {% if msg.source == panel.agent_id %}
-                            <div class="message sent">
-                                <div class="message-header">{{ msg.source }} -> {{ msg.destination }}{% if msg.channel %} ({{ msg.channel }}){% endif %}:</div>
-                                {% if msg.content %}
-                                <div class="message-content">
-                                {{ msg.content }}
-                                </div>
-                                {% endif %}
-                                {% if msg.actions %}
-                                <div class="scrollable-content">
-                                <pre>[Actions]\n{{ msg.actions | tojson(indent=2) }}</pre>
-                                </div>
-                                {% endif %}
-                                {% if msg.observations %}
-                                <div class="scrollable-content">
-                                <pre>[Observations]\n{{ msg.observations | tojson(indent=2) }}</pre>
-                                </div>
-                                {% endif %}
-                            </div>
-                            {% else %}
-                            <div class="message received">
-                                <div class="message-header">{{ msg.source }} -> {{ msg.destination }}{% if msg.channel %} ({{ msg.channel }}){% endif %}:</div>
-                                {% if msg.content %}
-                                <div class="message-content">
-                                {{ msg.content }}
-                                </div>
-                                {% endif %}
-                                {% if msg.actions %}
-                                <div class="scrollable-content">
-                                <pre>[Actions]\n{{ msg.actions | tojson(indent=2) }}</pre>
-                                </div>
-                                {% endif %}
-                                {% if msg.observations %}
-                                <div class="scrollable-content">
-                                <pre>[Observations]\n{{ msg.observations | tojson(indent=2) }}</pre>
-                                </div>
-                                {% endif %}
-                            </div>
-                            {% endif %}
-                        {% endfor %}
-                    </div>
+                    <!-- Filled in by the page script as messages arrive -->
+                    <div class="messages {% if panel.agent_id == 'Global Messages' %}global-messages{% endif %}"></div>
                 </div>
             </div>
             {% endfor %}
@@ -926,49 +1245,8 @@ VISUAL_TEMPLATE = '''
                         <pre>{{ panel.content }}</pre>
                     </div>
                     {% endif %}
-                    <div class="messages {% if panel.agent_id == 'Global Messages' %}global-messages{% endif %}">
-                        {% for msg in panel.messages %}
-                            {% if msg.source == panel.agent_id %}
-                            <div class="message sent">
-                                <div class="message-header">{{ msg.source }} -> {{ msg.destination }}{% if msg.channel %} ({{ msg.channel }}){% endif %}:</div>
-                                {% if msg.content %}
-                                <div class="message-content">
-                                {{ msg.content }}
-                                </div>
-                                {% endif %}
-                                {% if msg.actions %}
-                                <div class="scrollable-content">
-                                <pre>[Actions]\n{{ msg.actions | tojson(indent=2) }}</pre>
-                                </div>
-                                {% endif %}
-                                {% if msg.observations %}
-                                <div class="scrollable-content">
-                                <pre>[Observations]\n{{ msg.observations | tojson(indent=2) }}</pre>
-                                </div>
-                                {% endif %}
-                            </div>
-                            {% else %}
-                            <div class="message received">
-                                <div class="message-header">{{ msg.source }} -> {{ msg.destination }}{% if msg.channel %} ({{ msg.channel }}){% endif %}:</div>
-                                {% if msg.content %}
-                                <div class="message-content">
-                                {{ msg.content }}
-                                </div>
-                                {% endif %}
-                                {% if msg.actions %}
-                                <div class="scrollable-content">
-                                <pre>[Actions]\n{{ msg.actions | tojson(indent=2) }}</pre>
-                                </div>
-                                {% endif %}
-                                {% if msg.observations %}
-                                <div class="scrollable-content">
-                                <pre>[Observations]\n{{ msg.observations | tojson(indent=2) }}</pre>
-                                </div>
-                                {% endif %}
-                            </div>
-                            {% endif %}
-                        {% endfor %}
-                    </div>
+                    <!-- Filled in by the page script as messages arrive -->
+                    <div class="messages {% if panel.agent_id == 'Global Messages' %}global-messages{% endif %}"></div>
                 </div>
             </div>
             {% endfor %}
@@ -987,10 +1265,18 @@ VISUAL_TEMPLATE = '''
 </html>
 '''
 
+# The page template never changes, so it is compiled once for all debuggers. Autoescaping
+# matches what Flask applies to templates rendered from strings.
+_JINJA_ENV = jinja2.Environment(autoescape=True, auto_reload=False)
+_PAGE_TEMPLATE = _JINJA_ENV.from_string(VISUAL_TEMPLATE)
+
 
 class VisualDebugger:
-    def __init__(self, port: int = 5000):
+    def __init__(self, port: int = 5000, max_messages: int = MAX_MESSAGES):
         self.app = Flask(__name__)
+        # jsonify sorts keys and, in debug mode, indents by default; neither is needed here
+        self.app.json.sort_keys = False
+        self.app.json.compact = True
         # Disable Flask's default logger
         log = logging.getLogger('werkzeug')
         log.setLevel(logging.ERROR)
@@ -999,6 +1285,28 @@ class VisualDebugger:
         self.teams: List = []
         self.channels: List = []
         self._states: Dict = {}  # Store agent and team states
+        # Update sequence number, advanced whenever a refresh sees new messages or panel content
+        self._seq = 0
+        # (seq, message, message JSON) of the most recent logged messages
+        self._messages: Deque = deque(maxlen=max_messages)
+        # Messages read so far, numbering each message so the page can return to it after a reload
+        self._message_count = 0
+        # Messages log being read, and the offset up to which it has been read
+        self._messages_log_file: Optional[str] = None
+        self._messages_log_offset = 0
+        self._agent_logs: Dict = {}  # {log_file: ((size, mtime), content)}
+        self._panel_contents: Dict = {}  # {panel_id: (seq, content)}
+        self._panels: List = []  # [(panel_id, kind)] in display order
+        # {scratchpad_id: (seq, [(seq, line)])}, with None lines once the scratchpad is deleted
+        self._scratchpads: Dict = {}
+        self._updates_lock = threading.Lock()
+        # While update streams are open, one refresher thread checks for new data and wakes
+        # the streams through this condition when the update sequence advances
+        self._updates_changed = threading.Condition(self._updates_lock)
+        self._stream_count = 0
+        self._refresher: Optional[threading.Thread] = None
+        # Sequence numbers restart with the debugger, so tags based on them carry a per-run prefix
+        self._etag_prefix = os.urandom(4).hex()
         self._setup_routes()
         self.server_thread: Optional[threading.Thread] = None
         
@@ -1011,48 +1319,49 @@ class VisualDebugger:
         team_agent_id = f"team:{team._name}"
         return self._states.get(team_agent_id)
 
-    def _get_agent_messages(self, messages_log_file: str, agent_id: str) -> List[Dict]:
-        """Get sent and received messages for an agent."""
-        if not os.path.exists(messages_log_file):
-            return []
-        
-        messages = []
+    def _read_new_messages(self, messages_log_file: str) -> List[Dict]:
+        """Read the well-formed messages appended to a messages log since the last call."""
+        if messages_log_file != self._messages_log_file:
+            self._messages_log_file = messages_log_file
+            self._messages_log_offset = 0
         try:
-            with open(messages_log_file, 'r') as f:
-                for line in f:
-                    try:
-                        msg = json.loads(line.strip())
-                        if "source" not in msg or "destination" not in msg or "content" not in msg:
-                            continue
-                        if msg['source'] == agent_id or msg['destination'] == agent_id:
-                            messages.append(msg)
-                    except json.JSONDecodeError:
-                        continue
-        except Exception as e:
+            with open(messages_log_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < self._messages_log_offset:
+                    # The log was truncated or replaced, so read it again from the start
+                    self._messages_log_offset = 0
+                f.seek(self._messages_log_offset)
+                data = f.read()
+        except OSError:
             return []
+
+        lines = data.split(b'\n')
+        # The last line may still be being written, so unless it is complete it is read again
+        # next time
+        tail = lines.pop()
+        consumed = len(data) - len(tail)
+        messages = [msg for msg in map(_parse_message, lines) if msg is not None]
+        if tail.strip():
+            msg = _parse_message(tail)
+            if msg is not None:
+                messages.append(msg)
+                consumed = len(data)
+        self._messages_log_offset += consumed
         return messages
 
-    def _get_all_messages(self, messages_log_file: str) -> List[Dict]:
-        """Get all messages excluding self-messages and messages with actions/observations."""
-        if not os.path.exists(messages_log_file):
-            return []
-        
-        messages = []
+    def _read_agent_log(self, log_file: str) -> str:
+        """Read an agent log, reusing the last read while the file is unchanged."""
         try:
-            with open(messages_log_file, 'r') as f:
-                for line in f:
-                    try:
-                        msg = json.loads(line.strip())
-                        if "source" not in msg or "destination" not in msg or "content" not in msg:
-                            continue
-                        # Exclude self-messages and messages with actions/observations
-                        if msg['source'] != msg['destination'] and not msg['actions'] and not msg['observations']:
-                            messages.append(msg)
-                    except json.JSONDecodeError:
-                        continue
-        except Exception as e:
-            return []
-        return messages
+            stat = os.stat(log_file)
+            key = (stat.st_size, stat.st_mtime_ns)
+            cached = self._agent_logs.get(log_file)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            with open(log_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except (OSError, ValueError):
+            return "No log data available yet..."
+        self._agent_logs[log_file] = (key, content)
+        return content
 
     def _get_team_scratchpads(self, team) -> List[Dict]:
         """Get all scratchpads from a team's scratchpad service."""
@@ -1085,114 +1394,325 @@ class VisualDebugger:
             print(traceback.format_exc())
         return scratchpads
 
+    def _read_panel_contents(self):
+        """Yield the (panel_id, kind, content) of every panel, in display order.
+
+        The content of a scratchpad panel is the list of its team's scratchpads, and that of
+        other panels is text.
+        """
+        # Global Messages panel first
+        if 'messages' in self.log_files:
+            yield 'Global Messages', 'global', ''
+
+        # Scratchpads panel if any team has scratchpad service
+        for team in self.teams:
+            has_scratchpad = any(service.__class__.__name__ == "TeamScratchpad" for service in team._services)
+            if has_scratchpad:
+                yield f'{team._name} Scratchpads', 'scratchpad', self._get_team_scratchpads(team)
+
+        # Agent panels
+        for agent_id, log_file in self.log_files.items():
+            if agent_id == 'messages':
+                continue
+
+            yield agent_id, 'agent', self._read_agent_log(log_file)
+
+    def _refresh(self):
+        """Pick up new messages and panel contents, advancing the update sequence on changes."""
+        seq = self._seq + 1
+        changed = False
+
+        messages_log_file = self.log_files.get('messages')
+        if messages_log_file:
+            # The log is append-only, so only the lines past those already read are new
+            new_messages = self._read_new_messages(messages_log_file)
+            if new_messages:
+                # Messages never change once logged, so each is serialized only once
+                first_index = self._message_count
+                self._messages.extend(
+                    (seq, msg, self._dumps_json({**msg, 'log_index': first_index + i}))
+                    for i, msg in enumerate(new_messages)
+                )
+                self._message_count += len(new_messages)
+                changed = True
+
+        panels = []
+        scratchpads = []
+        for panel_id, kind, content in self._read_panel_contents():
+            panels.append((panel_id, kind))
+            if kind == 'scratchpad':
+                scratchpads.extend(content)
+                content = self._dumps_pretty_json(content)
+            known = self._panel_contents.get(panel_id)
+            if known is None or known[1] != content:
+                self._panel_contents[panel_id] = (seq, content)
+                changed = True
+        self._panels = panels
+
+        if self._refresh_scratchpads(scratchpads, seq):
+            changed = True
+        if changed:
+            self._seq = seq
+
+    def _refresh_scratchpads(self, scratchpads: List[Dict], seq: int) -> bool:
+        """Record which scratchpads and scratchpad lines changed, returning whether any did."""
+        changed = False
+        current_ids = set()
+        for scratchpad in scratchpads:
+            current_ids.add(scratchpad['id'])
+            known = self._scratchpads.get(scratchpad['id'])
+            known_lines = known[1] if known is not None and known[1] is not None else []
+            lines = scratchpad['lines']
+            if len(lines) == len(known_lines) and all(
+                line == known_line for line, (_, known_line) in zip(lines, known_lines)
+            ):
+                continue
+            # Unchanged lines keep the sequence number they were last changed at
+            self._scratchpads[scratchpad['id']] = (seq, [
+                known_lines[i] if i < len(known_lines) and known_lines[i][1] == line else (seq, line)
+                for i, line in enumerate(lines)
+            ])
+            changed = True
+
+        for scratchpad_id, (_, lines) in list(self._scratchpads.items()):
+            if scratchpad_id not in current_ids and lines is not None:
+                self._scratchpads[scratchpad_id] = (seq, None)
+                changed = True
+        return changed
+
+    def _collect_scratchpad_updates(self, since: int) -> List[Dict]:
+        """Collect the scratchpads that changed after an update sequence number.
+
+        Each changed scratchpad has the index of its first changed line and the lines from
+        there on, or is marked as removed.
+        """
+        updates = []
+        for scratchpad_id, (scratchpad_seq, lines) in self._scratchpads.items():
+            if scratchpad_seq <= since:
+                continue
+            if lines is None:
+                updates.append({'id': scratchpad_id, 'removed': True})
+                continue
+            start = next((i for i, (line_seq, _) in enumerate(lines) if line_seq > since), len(lines))
+            updates.append({'id': scratchpad_id, 'start': start, 'lines': [line for _, line in lines[start:]]})
+        return updates
+
+    def _collect_updates(
+        self, since: int = 0, scratchpads_since: Optional[int] = None, refresh: bool = True
+    ) -> Dict:
+        """Collect what changed in the panels after an update sequence number.
+        
+        Args:
+            since: Sequence number of the last update the caller has, or 0 for everything
+            scratchpads_since: Sequence number the caller's scratchpads are up to date with, or
+                None to leave out scratchpads
+            refresh: Whether to check for new data first, rather than rely on the refresher
+
+        Returns:
+            Dict with the current sequence number and the panels that changed, each with its
+            new content, if that changed, and the serialized messages it gained, plus the
+            scratchpads that changed if asked for
+        """
+        with self._updates_lock:
+            if refresh:
+                self._refresh()
+
+            new_messages = []
+            for message_seq, msg, msg_json in reversed(self._messages):
+                if message_seq <= since:
+                    break
+                new_messages.append((msg, msg_json))
+            new_messages.reverse()
+
+            # Sort the new messages into the panels they belong to in one pass
+            global_messages = []
+            agent_messages = defaultdict(list)
+            for msg, msg_json in new_messages:
+                agent_messages[msg['source']].append(msg_json)
+                if msg['destination'] != msg['source']:
+                    agent_messages[msg['destination']].append(msg_json)
+                if _is_global_message(msg):
+                    global_messages.append(msg_json)
+
+            panels = []
+            for panel_id, kind in self._panels:
+                if kind == 'global':
+                    messages = global_messages
+                elif kind == 'agent':
+                    messages = agent_messages.get(panel_id, [])
+                else:
+                    messages = []
+                content_seq, content = self._panel_contents[panel_id]
+                if content_seq > since:
+                    panels.append({'agent_id': panel_id, 'content': content, 'messages': messages})
+                elif messages:
+                    panels.append({'agent_id': panel_id, 'messages': messages})
+            updates = {'seq': self._seq, 'panels': panels}
+            if scratchpads_since is not None:
+                updates['scratchpads'] = self._collect_scratchpad_updates(scratchpads_since)
+            return updates
+
+    def _open_stream(self):
+        """Count an opened update stream, starting the refresher if it is not running."""
+        with self._updates_lock:
+            self._stream_count += 1
+            if self._refresher is None:
+                self._refresher = threading.Thread(target=self._run_refresher, daemon=True)
+                self._refresher.start()
+
+    def _close_stream(self):
+        """Count a closed update stream; the refresher stops once none are open."""
+        with self._updates_lock:
+            self._stream_count -= 1
+
+    def _run_refresher(self):
+        """Check for new data for all open update streams, waking them on changes."""
+        while True:
+            time.sleep(UPDATE_INTERVAL_SECONDS)
+            with self._updates_changed:
+                if self._stream_count == 0:
+                    self._refresher = None
+                    return
+                seq = self._seq
+                self._refresh()
+                if self._seq != seq:
+                    self._updates_changed.notify_all()
+
+    def _dumps_json(self, payload) -> bytes:
+        """Serializes a payload into compact JSON, using orjson when available."""
+        if orjson is not None:
+            try:
+                return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                # Fall back to Flask's encoder for types orjson does not handle
+                pass
+        return self.app.json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+    def _dumps_updates(self, updates: Dict) -> bytes:
+        """Serializes updates, splicing in the already serialized messages of each panel."""
+        panels = []
+        for panel in updates['panels']:
+            head = self._dumps_json({key: value for key, value in panel.items() if key != 'messages'})
+            panels.append(head[:-1] + b',"messages":[' + b','.join(panel['messages']) + b']}')
+        head = self._dumps_json({key: value for key, value in updates.items() if key != 'panels'})
+        return head[:-1] + b',"panels":[' + b','.join(panels) + b']}'
+
+    def _dumps_pretty_json(self, payload) -> str:
+        """Serializes a payload into JSON indented for display, using orjson when available."""
+        if orjson is not None:
+            try:
+                return orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode('utf-8')
+            except TypeError:
+                # Fall back to the standard library for types orjson does not handle
+                pass
+        return json.dumps(payload, indent=2)
+
+    def _json_response(self, payload, status: int = 200) -> Response:
+        """Serializes a payload into a JSON response."""
+        return self._json_bytes_response(self._dumps_json(payload), status)
+
+    def _not_modified(self, etag: str) -> Optional[Response]:
+        """Makes a 304 Not Modified response if the client already has the tagged JSON."""
+        if not request.if_none_match.contains_weak(etag):
+            return None
+        response = Response(status=304)
+        self._tag_response(response, etag)
+        return response
+
+    def _tag_response(self, response: Response, etag: str):
+        """Tags a response, making clients check it with If-None-Match before reusing it."""
+        response.vary.add('Accept-Encoding')
+        # Weak, as the tag stays the same whether or not the response is gzipped
+        response.set_etag(etag, weak=True)
+        response.cache_control.no_cache = True
+
+    def _json_bytes_response(self, body: bytes, status: int = 200, etag: Optional[str] = None) -> Response:
+        """Makes a JSON response, gzipped if large and the client accepts it.
+
+        Successful responses are tagged with an ETag. Without a given tag, the tag is a hash
+        of the body and the response is replaced by 304 Not Modified when the client already
+        has it; callers giving a tag check it with _not_modified before building the body.
+        """
+        response = Response(body, status=status, mimetype='application/json')
+        response.vary.add('Accept-Encoding')
+        if status == 200:
+            if etag is None:
+                etag = hashlib.sha1(body).hexdigest()
+                not_modified = self._not_modified(etag)
+                if not_modified is not None:
+                    return not_modified
+            self._tag_response(response, etag)
+        if len(body) >= COMPRESS_MIN_BYTES and request.accept_encodings['gzip']:
+            response.set_data(gzip.compress(body, compresslevel=COMPRESS_LEVEL))
+            response.content_encoding = 'gzip'
+        return response
+
     def _setup_routes(self):
         @self.app.route('/')
         def home():
-            panels = []
-            messages_log_file = next((log_file for agent_id, log_file in self.log_files.items() if agent_id == 'messages'), None)
-            
-            # Add Global Messages panel first
-            if messages_log_file:
-                global_messages = self._get_all_messages(messages_log_file)
-                panels.append({
-                    'agent_id': 'Global Messages',
-                    'content': '',
-                    'messages': global_messages,
-                    'last_message_count': len(global_messages)
-                })
-
-            # Add Scratchpads panel if any team has scratchpad service
-            for team in self.teams:
-                has_scratchpad = any(service.__class__.__name__ == "TeamScratchpad" for service in team._services)
-                if has_scratchpad:
-                    scratchpads = self._get_team_scratchpads(team)
-                    panels.append({
-                        'agent_id': f'{team._name} Scratchpads',
-                        'content': json.dumps(scratchpads, indent=2),
-                        'messages': [],
-                        'last_message_count': 0
-                    })
-            
-            # Add agent panels
-            for agent_id, log_file in self.log_files.items():
-                if agent_id == 'messages':
-                    continue
-                    
-                try:
-                    with open(log_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                except:
-                    content = "No log data available yet..."
-                    
-                agent_messages = []
-                if messages_log_file:
-                    agent_messages = self._get_agent_messages(messages_log_file, agent_id)
-                
-                panels.append({
-                    'agent_id': agent_id,
-                    'content': content,
-                    'messages': agent_messages,
-                    'last_message_count': len(agent_messages)
-                })
-            
-            return render_template_string(VISUAL_TEMPLATE, panels=panels)
+            updates = self._collect_updates()
+            return _PAGE_TEMPLATE.render(panels=updates['panels'])
             
+        # The page follows the /events stream; /updates is kept for API clients
         @self.app.route('/updates')
         def get_updates():
-            panels = []
-            messages_log_file = next((log_file for agent_id, log_file in self.log_files.items() if agent_id == 'messages'), None)
-            
-            # Add Global Messages panel first
-            if messages_log_file:
-                global_messages = self._get_all_messages(messages_log_file)
-                panels.append({
-                    'agent_id': 'Global Messages',
-                    'content': '',
-                    'messages': global_messages
-                })
-
-            # Add Scratchpads panel if any team has scratchpad service
-            for team in self.teams:
-                has_scratchpad = any(service.__class__.__name__ == "TeamScratchpad" for service in team._services)
-                if has_scratchpad:
-                    scratchpads = self._get_team_scratchpads(team)
-                    panels.append({
-                        'agent_id': f'{team._name} Scratchpads',
-                        'content': json.dumps(scratchpads, indent=2),
-                        'messages': []
-                    })
-            
-            # Add agent panels
-            for agent_id, log_file in self.log_files.items():
-                if agent_id == 'messages':
-                    continue
-                    
+            updates = self._collect_updates(
+                request.args.get('since', 0, type=int),
+                request.args.get('scratchpads_since', type=int),
+            )
+            # The updates asked for stay the same until the sequence number advances, so a
+            # client that has them is answered without serializing them again
+            etag = f"{self._etag_prefix}-{updates['seq']}"
+            not_modified = self._not_modified(etag)
+            if not_modified is not None:
+                return not_modified
+            return self._json_bytes_response(self._dumps_updates(updates), etag=etag)
+
+        @self.app.route('/events')
+        def get_events():
+            # A reconnecting EventSource sends the id of the last event it received
+            since = request.args.get('since', 0, type=int)
+            # Scratchpad changes are only streamed to pages showing the scratchpads
+            scratchpads_since = request.args.get('scratchpads_since', type=int)
+            last_event_id = request.headers.get('Last-Event-ID', '')
+            if last_event_id.isdigit():
+                since = int(last_event_id)
+
+            def stream():
+                nonlocal since, scratchpads_since
+                self._open_stream()
                 try:
-                    with open(log_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                except:
-                    content = "No log data available yet..."
-                    
-                agent_messages = []
-                if messages_log_file:
-                    agent_messages = self._get_agent_messages(messages_log_file, agent_id)
-                
-                panels.append({
-                    'agent_id': agent_id,
-                    'content': content,
-                    'messages': agent_messages
-                })
-            
-            return {'panels': panels}
+                    # Only the first update is collected fresh; after that the shared refresher
+                    # checks for new data and wakes the stream when there is some
+                    updates = self._collect_updates(since, scratchpads_since)
+                    while True:
+                        if updates is not None and (updates['seq'] > since or updates.get('scratchpads')):
+                            since = updates['seq']
+                            if scratchpads_since is not None:
+                                scratchpads_since = since
+                            yield b'id: %d\ndata: %s\n\n' % (since, self._dumps_updates(updates))
+                        with self._updates_changed:
+                            changed = self._updates_changed.wait_for(
+                                lambda: self._seq > since, timeout=KEEPALIVE_INTERVAL_SECONDS
+                            )
+                        if changed:
+                            updates = self._collect_updates(since, scratchpads_since, refresh=False)
+                        else:
+                            updates = None
+                            yield b': keep-alive\n\n'
+                finally:
+                    self._close_stream()
+
+            return Response(stream(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
 
         @self.app.route('/team_info')
         def get_team_info():
             try:
                 team_data = self._get_team_info()
-                return jsonify(team_data)
+                return self._json_response(team_data)
             except Exception as e:
                 print(f"Error in team_info route: {str(e)}")
-                return jsonify({'error': str(e)}), 500
+                return self._json_response({'error': str(e)}, 500)
 
         @self.app.route('/scratchpads')
         def get_scratchpads():
@@ -1201,15 +1721,18 @@ class VisualDebugger:
                 for team in self.teams:
                     scratchpads = self._get_team_scratchpads(team)
                     all_scratchpads.extend(scratchpads)
-                return jsonify({'scratchpads': all_scratchpads})
+                return self._json_response({'scratchpads': all_scratchpads})
             except Exception as e:
                 print(f"Error in scratchpads route: {str(e)}")
-                return jsonify({'error': str(e)}), 500
+                return self._json_response({'error': str(e)}, 500)
 
     def start(self):
         def run_flask():
-            # Disable Flask access logging
-            self.app.run(port=self.port, debug=False, use_reloader=False)
+            if serve is not None:
+                serve(self.app, host='127.0.0.1', port=self.port, threads=SERVER_THREADS)
+            else:
+                # Disable Flask access logging
+                self.app.run(port=self.port, debug=False, use_reloader=False)
             
         self.server_thread = threading.Thread(target=run_flask)
         self.server_thread.daemon = True
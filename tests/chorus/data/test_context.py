@@ -0,0 +1,45 @@
+from chorus.data import AgentContext
+from chorus.data.executable_tool import SimpleExecutableTool
+from chorus.data.toolschema import ToolSchema
+
+
+class EchoTool(SimpleExecutableTool):
+    def __init__(self, tool_name: str):
+        schema = {
+            "tool_name": tool_name,
+            "name": tool_name,
+            "description": "Echoes its input.",
+            "actions": [
+                {
+                    "name": "echo",
+                    "description": "Echo a number",
+                    "input_schema": {
+                        "type": "object",
+                        "properties": {"value": {"type": "integer", "description": "Value"}},
+                    },
+                }
+            ],
+        }
+        super().__init__(ToolSchema.model_validate(schema))
+
+    def echo(self, value: int):
+        return value
+
+
+def test_tool_schemas_are_cached_until_tools_change():
+    first_tool = EchoTool("First")
+    context = AgentContext(agent_id="agent", tools=[first_tool])
+
+    tool_schemas = context.get_tool_schemas()
+    assert [schema.tool_name for schema in tool_schemas] == ["First"]
+    assert context.get_tool_schemas() is tool_schemas
+    assert list(context.get_tool_action_map()) == ["First"]
+    assert context.get_tool_action_map()["First"]["echo"].name == "echo"
+
+    second_tool = EchoTool("Second")
+    context.tools.append(second_tool)
+    assert [schema.tool_name for schema in context.get_tool_schemas()] == ["First", "Second"]
+    assert "echo" in context.get_tool_action_map()["Second"]
+
+    context.tools = [second_tool]
+    assert list(context.get_tool_action_map()) == ["Second"]
@@ -0,0 +1,195 @@
+import pytest
+
+from chorus.data.toolschema import ToolSchema
+from chorus.util.anthropic_tools import construct_prompt_from_messages
+from chorus.util.anthropic_tools import construct_schema_prompt_for_chorus_tools
+from chorus.util.anthropic_tools import construct_tool_use_system_prompt
+from chorus.util.anthropic_tools import extract_function_calls
+from chorus.util.anthropic_tools import validate_messages
+
+
+def test_extract_function_calls_without_tags():
+    assert extract_function_calls("Just a plain answer.") == {"status": True, "invokes": []}
+
+
+def test_extract_function_calls_parses_invokes():
+    completion = (
+        "Let me search.\n"
+        "<function_calls>\n"
+        "<invoke>\n"
+        "<tool_name>WebSearchTool.search</tool_name>\n"
+        "<parameters>\n"
+        '<parameter name="query">speculative decoding</parameter>\n'
+        '<parameter name="num_results">5</parameter>\n'
+        "</parameters>\n"
+        "</invoke>\n"
+        "<invoke>\n"
+        "<tool_name>WebRetrieverTool.retrieve</tool_name>\n"
+        "<parameters>\n"
+        '<parameter name="url">https://example.com</parameter>\n'
+        "</parameters>\n"
+        "</invoke>\n"
+        "</function_calls>"
+    )
+    result = extract_function_calls(completion)
+    assert result["status"]
+    assert result["prefix_content"] == "Let me search.\n"
+    assert result["invokes"] == [
+        {
+            "tool_name": "WebSearchTool.search",
+            "parameters_with_values": [("query", "speculative decoding"), ("num_results", "5")],
+        },
+        {
+            "tool_name": "WebRetrieverTool.retrieve",
+            "parameters_with_values": [("url", "https://example.com")],
+        },
+    ]
+
+
+def test_extract_function_calls_keeps_code_blocks_verbatim():
+    code = '```python\nprint("<parameter name=\\"x\\">")\n```'
+    completion = (
+        "<function_calls><invoke><tool_name>Runner.run</tool_name><parameters>"
+        f'<parameter name="code">{code}</parameter>'
+        '<parameter name="second">```a``` and ```b```</parameter>'
+        "</parameters></invoke></function_calls>"
+    )
+    result = extract_function_calls(completion)
+    assert result["status"]
+    assert result["invokes"][0]["parameters_with_values"] == [
+        ("code", code),
+        ("second", "```a``` and ```b```"),
+    ]
+
+
+def test_extract_function_calls_reports_malformed_calls():
+    missing_invoke = extract_function_calls("<function_calls>nothing</function_calls>")
+    assert not missing_invoke["status"]
+    assert "<invoke>" in missing_invoke["reason"]
+
+    missing_tool_name = extract_function_calls(
+        "<function_calls><invoke><parameters></parameters></invoke></function_calls>"
+    )
+    assert not missing_tool_name["status"]
+    assert "<tool_name>" in missing_tool_name["reason"]
+
+    imbalanced = extract_function_calls(
+        "<function_calls><invoke><tool_name>T.a</tool_name><parameters>"
+        '<parameter name="x">1</parameters></invoke></function_calls>'
+    )
+    assert imbalanced == {
+        "status": False,
+        "reason": "Imbalanced tags inside <parameters></parameters> tags.",
+    }
+
+
+def test_extract_function_calls_ignores_tags_inside_code_blocks():
+    code = '```xml\n<parameter name="inner">1</parameter>\n```'
+    completion = (
+        "<function_calls><invoke><tool_name>Runner.run</tool_name><parameters>"
+        f'<parameter name="code">before {code} after</parameter>'
+        "</parameters></invoke></function_calls>"
+    )
+    result = extract_function_calls(completion)
+    assert result["invokes"][0]["parameters_with_values"] == [("code", f"before {code} after")]
+
+
+def test_extract_function_calls_pairs_parameters_in_order():
+    completion = (
+        "<function_calls><invoke><tool_name>T.a</tool_name><parameters>"
+        '<parameter name="x(1)">first</parameter>'
+        '<parameter name="x(1)">second</parameter>'
+        "</parameters></invoke></function_calls>"
+    )
+    result = extract_function_calls(completion)
+    assert result["invokes"][0]["parameters_with_values"] == [("x(1)", "first"), ("x(1)", "second")]
+
+    non_matching = extract_function_calls(
+        "<function_calls><invoke><tool_name>T.a</tool_name><parameters>"
+        '<parameter name="x"><parameter name="y"></parameter></parameter>'
+        "</parameters></invoke></function_calls>"
+    )
+    assert not non_matching["status"]
+    assert non_matching["reason"].startswith("Non-matching")
+
+
+def test_construct_prompt_from_messages():
+    messages = [
+        {"role": "user", "content": "Find a paper."},
+        {
+            "role": "tool_inputs",
+            "content": "Searching.",
+            "tool_inputs": [{"tool_name": "Arxiv.search", "tool_arguments": {"query": "llm"}}],
+        },
+        {
+            "role": "tool_outputs",
+            "tool_outputs": [{"tool_name": "Arxiv.search", "tool_result": "paper"}],
+            "tool_error": None,
+        },
+        {"role": "assistant", "content": "Found it."},
+    ]
+    assert construct_prompt_from_messages(messages) == (
+        "\n\nHuman: Find a paper."
+        "\n\nAssistant:Searching.\n\n<function_calls>\n<invoke>\n<tool_name>Arxiv.search</tool_name>\n"
+        "<parameters>\n<query>llm</query>\n</parameters>\n</invoke>\n</function_calls>"
+        "\n\n<function_results>\n<result>\n<tool_name>Arxiv.search</tool_name>\n<stdout>\npaper\n"
+        "</stdout>\n</result>\n</function_results>"
+        "\n\nFound it."
+    )
+
+
+def test_validate_messages_rejects_invalid_messages():
+    with pytest.raises(ValueError, match="bad is not a valid role"):
+        validate_messages([{"role": "bad"}])
+    with pytest.raises(ValueError, match="content must be a string"):
+        validate_messages([{"role": "user", "content": 1}])
+    with pytest.raises(ValueError, match="tool_inputs must be a list"):
+        validate_messages([{"role": "tool_inputs", "tool_inputs": []}])
+    with pytest.raises(ValueError, match="Only one of tool_outputs and tool_error"):
+        validate_messages([{"role": "tool_outputs", "tool_outputs": [], "tool_error": "error"}])
+
+
+def test_construct_schema_prompt_for_chorus_tools_reuses_action_prompts():
+    tool = ToolSchema.model_validate(
+        {
+            "tool_name": "WeatherTool",
+            "name": "WeatherTool",
+            "description": "Checks weather.",
+            "actions": [
+                {
+                    "name": "check",
+                    "description": "Check the weather",
+                    "input_schema": {
+                        "type": "object",
+                        "properties": {"city": {"type": "string", "description": "City"}},
+                        "required": ["city"],
+                    },
+                }
+            ],
+        }
+    )
+    prompt = construct_schema_prompt_for_chorus_tools([tool])
+    assert "<tool_name>WeatherTool.check</tool_name>" in prompt
+    assert "<name>city</name>" in prompt
+    assert construct_schema_prompt_for_chorus_tools([tool]) == prompt
+
+
+def test_construct_tool_use_system_prompt_formats_each_tool_once():
+    class FakeTool:
+        def __init__(self, name):
+            self.name = name
+            self.format_calls = 0
+
+        def format_tool_for_claude(self):
+            self.format_calls += 1
+            return f"<tool_description>{self.name}</tool_description>"
+
+    tools = [FakeTool("a"), FakeTool("b")]
+    prompt = construct_tool_use_system_prompt(tools)
+    assert prompt.startswith("In this environment you have access to a set of tools")
+    assert prompt.endswith(
+        "<tools>\n<tool_description>a</tool_description>\n"
+        "<tool_description>b</tool_description>\n</tools>"
+    )
+    assert construct_tool_use_system_prompt(tools) == prompt
+    assert [tool.format_calls for tool in tools] == [1, 1]
@@ -0,0 +1,184 @@
+import logging
+import threading
+from unittest.mock import MagicMock
+
+from chorus.data import ActionData
+from chorus.data import AgentContext
+from chorus.data import AgentState
+from chorus.data import EventType
+from chorus.data import Message
+from chorus.data.executable_tool import SimpleExecutableTool
+from chorus.data.prompt import StructuredPrompt
+from chorus.data.toolschema import ToolSchema
+from chorus.executors import SimpleToolExecutor
+from chorus.prompters import InteractPrompter
+from chorus.util.interact import fix_action_param_type
+from chorus.util.interact import orchestrate_execute_actions
+from chorus.util.async_actions import is_async_observation_data
+from chorus.util.async_actions import make_async_observation_data
+from chorus.util.interact import orchestrate_generate_turns
+
+SCHEMA = ToolSchema.model_validate(
+    {
+        "tool_name": "Calculator",
+        "name": "Calculator",
+        "description": "Adds numbers.",
+        "actions": [
+            {
+                "name": "add",
+                "description": "Add two numbers",
+                "input_schema": {
+                    "type": "object",
+                    "properties": {
+                        "a": {"type": "integer", "description": "First number"},
+                        "b": {"type": "number", "description": "Second number"},
+                        "label": {"type": "string", "description": "Label"},
+                    },
+                },
+            }
+        ],
+    }
+)
+
+
+def test_fix_action_param_type_converts_numeric_parameters():
+    tool_action_map = {"Calculator": {"add": SCHEMA.actions[0]}}
+    for _ in range(2):
+        action = ActionData(
+            tool_name="Calculator", action_name="add", parameters={"a": "1", "label": "7"}
+        )
+        assert fix_action_param_type(tool_action_map, action).parameters == {"a": 1, "label": "7"}
+
+    unknown = ActionData(tool_name="Calculator", action_name="subtract", parameters={"a": "1"})
+    assert fix_action_param_type(tool_action_map, unknown).parameters == {"a": "1"}
+    unknown_tool = ActionData(tool_name="Abacus", action_name="add", parameters={"a": "1"})
+    assert fix_action_param_type(tool_action_map, unknown_tool).parameters == {"a": "1"}
+
+
+def test_orchestrate_generate_turns_skips_prompt_dump_when_info_disabled():
+    context = AgentContext(agent_id="agent")
+    prompt = MagicMock(spec=StructuredPrompt)
+    prompter = MagicMock(spec=InteractPrompter)
+    prompter.get_prompt.return_value = prompt
+    prompter.parse_generation.return_value = []
+    lm = MagicMock()
+    lm.generate.return_value = "Done."
+
+    interact_logger = logging.getLogger("chorus.util.interact")
+    previous_level = interact_logger.level
+    interact_logger.setLevel(logging.WARNING)
+    try:
+        turns = orchestrate_generate_turns(context, AgentState(), [], prompter, lm)
+    finally:
+        interact_logger.setLevel(previous_level)
+    assert turns[0].content == "Done."
+    prompt.to_dict.assert_not_called()
+
+
+class BarrierTool(SimpleExecutableTool):
+    def __init__(self, tool_name: str, barrier: threading.Barrier, concurrent: bool):
+        schema = {
+            "tool_name": tool_name,
+            "name": tool_name,
+            "description": "Waits for other actions.",
+            "actions": [
+                {
+                    "name": "wait",
+                    "description": "Wait at the barrier",
+                    "input_schema": {"type": "object", "properties": {}},
+                }
+            ],
+        }
+        super().__init__(ToolSchema.model_validate(schema))
+        self._barrier = barrier
+        self._concurrent = concurrent
+
+    def supports_concurrent_execution(self):
+        return self._concurrent
+
+    def wait(self):
+        self._barrier.wait(timeout=5)
+        return self.get_schema().tool_name
+
+
+def test_orchestrate_execute_actions_runs_concurrent_actions_together():
+    barrier = threading.Barrier(2)
+    tools = [
+        BarrierTool("First", barrier, concurrent=True),
+        BarrierTool("Second", barrier, concurrent=True),
+        BarrierTool("Sequential", threading.Barrier(1), concurrent=False),
+    ]
+    context = AgentContext(agent_id="agent", tools=tools)
+    action_message = Message(
+        event_type=EventType.INTERNAL_EVENT,
+        actions=[
+            ActionData(tool_name=name, action_name="wait", parameters={}, tool_use_id=name)
+            for name in ("First", "Second", "Sequential")
+        ],
+    )
+
+    # Both barrier actions only return if they run at the same time
+    observation_message = orchestrate_execute_actions(
+        context, action_message, SimpleToolExecutor(tools, context)
+    )
+    assert [
+        (observation.tool_use_id, observation.data)
+        for observation in observation_message.observations
+    ] == [("First", "First"), ("Second", "Second"), ("Sequential", "Sequential")]
+
+
+class AsyncLaunchTool(SimpleExecutableTool):
+    def __init__(self):
+        schema = {
+            "tool_name": "Launcher",
+            "name": "Launcher",
+            "description": "Launches an async action.",
+            "actions": [
+                {
+                    "name": "launch",
+                    "description": "Launch the action",
+                    "input_schema": {"type": "object", "properties": {}},
+                }
+            ],
+        }
+        super().__init__(ToolSchema.model_validate(schema))
+
+    def supports_concurrent_execution(self):
+        return True
+
+    def launch(self):
+        return make_async_observation_data("launch", tool_name="Launcher")
+
+
+def test_orchestrate_execute_actions_keeps_batch_observations_of_async_action():
+    tools = [
+        BarrierTool("Sequential", threading.Barrier(1), concurrent=False),
+        BarrierTool("Concurrent", threading.Barrier(1), concurrent=True),
+        AsyncLaunchTool(),
+        BarrierTool("Later", threading.Barrier(1), concurrent=False),
+    ]
+    context = AgentContext(agent_id="agent", tools=tools)
+    action_message = Message(
+        event_type=EventType.INTERNAL_EVENT,
+        actions=[
+            ActionData(tool_name="Sequential", action_name="wait", parameters={}, tool_use_id="Sequential"),
+            ActionData(tool_name="Concurrent", action_name="wait", parameters={}, tool_use_id="Concurrent"),
+            ActionData(tool_name="Launcher", action_name="launch", parameters={}, tool_use_id="Launcher"),
+            ActionData(tool_name="Later", action_name="wait", parameters={}, tool_use_id="Later"),
+        ],
+    )
+
+    # The async action runs in a batch with the concurrent one, and stops the later action
+    observation_message = orchestrate_execute_actions(
+        context, action_message, SimpleToolExecutor(tools, context)
+    )
+    observations = observation_message.observations
+    assert [observation.tool_use_id for observation in observations] == [
+        "Sequential",
+        "Concurrent",
+        "Launcher",
+    ]
+    assert [observation.data for observation in observations[:2]] == ["Sequential", "Concurrent"]
+    assert is_async_observation_data(observations[2].data)
+    async_record = context.get_async_execution_cache()[observations[2].data["async_execution_id"]]
+    assert async_record.tool_use_id == "Launcher"
@@ -0,0 +1,14 @@
+from chorus.util.logging import chorus_logging_option
+
+
+def test_chorus_logging_option_follows_environment(monkeypatch):
+    monkeypatch.delenv("CHORUS_LOGGING", raising=False)
+    assert not chorus_logging_option("action")
+
+    monkeypatch.setenv("CHORUS_LOGGING", "Action,prompt")
+    assert chorus_logging_option("action")
+    assert chorus_logging_option("prompt")
+    assert not chorus_logging_option("observation")
+
+    monkeypatch.setenv("CHORUS_LOGGING", "all")
+    assert chorus_logging_option("observation")
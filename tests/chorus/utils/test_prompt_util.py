@@ -0,0 +1,26 @@
+import os
+
+import pytest
+
+from chorus.prompters.interact.simple_chat_prompter import SimpleChatPrompter
+from chorus.util.prompt_util import PrompterUtil
+
+
+def test_get_prompter_from_config_reloads_modified_files(tmp_path):
+    config_path = tmp_path / "prompter.yaml"
+    config_path.write_text("prompter: SimpleChatPrompter\nmodel_type: claude-3\n")
+
+    for _ in range(2):
+        prompter = PrompterUtil.get_prompter(None, config_path=str(config_path))
+        assert isinstance(prompter, SimpleChatPrompter)
+        assert prompter._model_type == "claude-3"
+
+    config_path.write_text("prompter: SimpleChatPrompter\nmodel_type: gpt\n")
+    modified_time = os.path.getmtime(config_path) + 1
+    os.utime(config_path, (modified_time, modified_time))
+    assert PrompterUtil.get_prompter(None, config_path=str(config_path))._model_type == "gpt"
+
+
+def test_get_prompter_rejects_unknown_prompter_type():
+    with pytest.raises(NotImplementedError):
+        PrompterUtil.get_prompter("SimpleChatPrompter", prompter_type="unknown")
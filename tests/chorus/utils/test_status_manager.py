@@ -0,0 +1,43 @@
+from chorus.data.agent_status import AgentStatus
+from chorus.util.status_manager import MultiAgentStatusManager
+
+
+def test_get_status_returns_latest_status():
+    status_manager = MultiAgentStatusManager()
+    assert status_manager.get_status("agent") is None
+
+    status_manager.record("agent", AgentStatus.BUSY)
+    status_manager.record("other", AgentStatus.BUSY)
+    status_manager.update_status("agent", AgentStatus.AVAILABLE)
+
+    assert status_manager.get_status("agent") == AgentStatus.AVAILABLE
+    assert status_manager.get_status("other") == AgentStatus.BUSY
+    assert [record[1:] for record in status_manager.get_records()] == [
+        ("agent", AgentStatus.BUSY),
+        ("other", AgentStatus.BUSY),
+        ("agent", AgentStatus.AVAILABLE),
+    ]
+
+
+def test_status_records_are_capped():
+    status_manager = MultiAgentStatusManager(max_records=2)
+    for agent_id in ("a", "b", "c"):
+        status_manager.record(agent_id, AgentStatus.BUSY)
+
+    assert [record[1] for record in status_manager.get_records()] == ["b", "c"]
+    assert status_manager.get_records()[-1][1] == "c"
+    assert status_manager.get_status("a") == AgentStatus.BUSY
+    assert [record[1] for record in status_manager.iter_records()] == ["b", "c"]
+
+
+def test_record_batch_shares_one_timestamp():
+    status_manager = MultiAgentStatusManager()
+    status_manager.record_batch([("a", AgentStatus.BUSY), ("b", AgentStatus.AVAILABLE)], now=42)
+    status_manager.update_status("a", AgentStatus.AVAILABLE, now=43)
+
+    assert list(status_manager.get_records()) == [
+        (42, "a", AgentStatus.BUSY),
+        (42, "b", AgentStatus.AVAILABLE),
+        (43, "a", AgentStatus.AVAILABLE),
+    ]
+    assert status_manager.get_status("a") == AgentStatus.AVAILABLE
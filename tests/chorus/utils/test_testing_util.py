@@ -0,0 +1,34 @@
+from chorus.data.dialog import Message
+from chorus.util.testing_util import MockMessageClient
+
+
+def test_filter_messages_matches_all_criteria():
+    client = MockMessageClient("agent")
+    messages = [
+        Message(source="a", destination="b", channel="x"),
+        Message(source="a", destination="c", channel="x"),
+        Message(source="b", destination="b", channel="y"),
+        Message(source="a", destination="b", channel="y"),
+    ]
+    for message in messages:
+        client.send_message(message)
+
+    assert client.filter_messages() == messages
+    assert client.filter_messages(source="a") == [messages[0], messages[1], messages[3]]
+    assert client.filter_messages(source="a", destination="b") == [messages[0], messages[3]]
+    assert client.filter_messages(destination="b", channel="y") == [messages[2], messages[3]]
+    assert client.filter_messages(source="a", destination="b", channel="y") == [messages[3]]
+    assert client.filter_messages(source="z") == []
+    assert client.wait_for_response(channel="y") is messages[2]
+
+
+def test_send_messages_skips_duplicates():
+    client = MockMessageClient("agent")
+    first = Message(source="a", channel="x")
+    second = Message(source="b", channel="x")
+    client.send_message(first)
+    client.send_messages([first, second, second])
+
+    assert client.fetch_all_messages() == [first, second]
+    assert client.filter_messages(channel="x") == [first, second]
+    assert second.message_id is not None
@@ -1,12 +1,20 @@
+import gzip
 import os
 import json
 import tempfile
+import threading
 import pytest
+from chorus.util import visual_debugger
 from chorus.util.visual_debugger import VisualDebugger
 import requests
 import time
+from datetime import datetime
+from types import SimpleNamespace
 from unittest.mock import patch
 
+from chorus.data.state import TeamState
+from chorus.teams.services.team_scratchpad import LineInfo, TeamScratchpad
+
 def test_visual_debugger_initialization():
     """Test basic initialization of visual debugger."""
     debugger = VisualDebugger(port=5050)
@@ -25,8 +33,12 @@ def test_add_agent_log():
     assert "agent2" in debugger.log_files
     assert debugger.log_files["agent2"] == "/path/to/log2"
 
-def test_get_agent_messages():
-    """Test parsing and filtering agent messages."""
+def _panel_messages(updates):
+    """Map each panel in an update to the contents of its messages."""
+    return {panel['agent_id']: [msg['content'] for msg in panel['messages']] for panel in updates['panels']}
+
+def test_updates_hold_agent_messages():
+    """Test that each agent panel gets the messages the agent sent or received."""
     debugger = VisualDebugger()
     
     # Create a temporary messages log file
@@ -36,23 +48,24 @@ def test_get_agent_messages():
             {"message_id": "1", "source": "agent1", "destination": "agent2", "content": "Hello"},
             {"message_id": "2", "source": "agent2", "destination": "agent1", "content": "Hi back"},
             {"message_id": "3", "source": "agent3", "destination": "agent1", "content": "Hey"},
-            {"message_id": "4", "source": "agent1", "destination": "agent3", "content": "Hello there"}
+            {"message_id": "4", "source": "agent1", "destination": "agent3", "content": "Hello there"},
+            {"message_id": "5", "source": "agent2", "destination": "agent2", "content": "Note to self"}
         ]
         for msg in messages:
             f.write(json.dumps(msg) + '\n')
     
     try:
-        # Test messages for agent1
-        agent1_messages = debugger._get_agent_messages(f.name, "agent1")
-        assert len(agent1_messages) == 4  # agent1 is involved in all messages
-        
-        # Test messages for agent2
-        agent2_messages = debugger._get_agent_messages(f.name, "agent2")
-        assert len(agent2_messages) == 2  # agent2 is involved in 2 messages
-        
-        # Verify message content
-        assert any(msg["content"] == "Hello" for msg in agent1_messages)
-        assert any(msg["content"] == "Hi back" for msg in agent2_messages)
+        debugger.add_agent_log("messages", f.name)
+        debugger.add_agent_log("agent1", "/nonexistent/agent1.log")
+        debugger.add_agent_log("agent2", "/nonexistent/agent2.log")
+        panel_messages = _panel_messages(debugger.app.test_client().get('/updates').get_json())
+
+        # agent1 is involved in the first four messages
+        assert panel_messages["agent1"] == ["Hello", "Hi back", "Hey", "Hello there"]
+        # A message to itself is listed once
+        assert panel_messages["agent2"] == ["Hello", "Hi back", "Note to self"]
+        # Self-messages stay out of the global panel
+        assert panel_messages["Global Messages"] == ["Hello", "Hi back", "Hey", "Hello there"]
         
     finally:
         # Clean up
@@ -106,17 +119,14 @@ def test_invalid_message_handling():
         f.write('{"message_id": "2", "source": "agent3", "destination": "agent4", "content": "Not for agent1"}\n')  # Valid but not for agent1
     
     try:
-        # Test messages for agent1
-        messages = debugger._get_agent_messages(f.name, "agent1")
-        assert len(messages) == 1  # Only the valid message for agent1 should be included
-        assert messages[0]["content"] == "Valid"
-        assert messages[0]["source"] == "agent1"
-        
-        # Test messages for agent3
-        messages = debugger._get_agent_messages(f.name, "agent3")
-        assert len(messages) == 1  # Only the valid message for agent3 should be included
-        assert messages[0]["content"] == "Not for agent1"
-        assert messages[0]["source"] == "agent3"
+        debugger.add_agent_log("messages", f.name)
+        debugger.add_agent_log("agent1", "/nonexistent/agent1.log")
+        debugger.add_agent_log("agent3", "/nonexistent/agent3.log")
+        panel_messages = _panel_messages(debugger.app.test_client().get('/updates').get_json())
+
+        # Only the valid message for each agent should be included
+        assert panel_messages["agent1"] == ["Valid"]
+        assert panel_messages["agent3"] == ["Not for agent1"]
         
     finally:
         # Clean up
@@ -126,6 +136,304 @@ def test_nonexistent_log_file():
     """Test handling of non-existent log files."""
     debugger = VisualDebugger()
     
-    # Test with non-existent file
-    messages = debugger._get_agent_messages("/nonexistent/file.log", "agent1")
-    assert messages == []  # Should return empty list for non-existent files 
\ No newline at end of file
+    # Test with non-existent files
+    debugger.add_agent_log("messages", "/nonexistent/file.log")
+    debugger.add_agent_log("agent1", "/nonexistent/agent1.log")
+    updates = debugger.app.test_client().get('/updates').get_json()
+    assert _panel_messages(updates) == {"Global Messages": [], "agent1": []}
+    assert updates['panels'][1]['content'] == "No log data available yet..."
+
+def test_home_page_renders_panels():
+    """Test that the home page renders a panel per agent log, escaping its content."""
+    debugger = VisualDebugger()
+
+    with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
+        f.write("<script>output</script>")
+        log_path = f.name
+
+    try:
+        debugger.add_agent_log("agent1", log_path)
+        client = debugger.app.test_client()
+        for _ in range(2):
+            page = client.get('/').get_data(as_text=True)
+            assert 'data-agent="agent1"' in page
+            assert "&lt;script&gt;output&lt;/script&gt;" in page
+    finally:
+        os.unlink(log_path)
+
+def test_updates_endpoint_returns_panels():
+    """Test that the updates endpoint serves the agent panels as JSON."""
+    debugger = VisualDebugger()
+
+    with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
+        f.write("Agent output")
+        log_path = f.name
+
+    try:
+        debugger.add_agent_log("agent1", log_path)
+        client = debugger.app.test_client()
+        response = client.get('/updates')
+        assert response.status_code == 200
+        assert response.mimetype == 'application/json'
+        updates = response.get_json()
+        assert updates['panels'] == [{'agent_id': 'agent1', 'content': 'Agent output', 'messages': []}]
+
+        # Nothing changed since the last update
+        seq = updates['seq']
+        assert client.get(f'/updates?since={seq}').get_json() == {'seq': seq, 'panels': []}
+    finally:
+        os.unlink(log_path)
+
+def test_updates_endpoint_sends_changes_only():
+    """Test that updates only hold the content and messages that changed."""
+    debugger = VisualDebugger()
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        agent_log = os.path.join(log_dir, "agent1.log")
+        messages_log = os.path.join(log_dir, "messages.jsonl")
+        with open(agent_log, 'w') as f:
+            f.write("Step 1")
+        with open(messages_log, 'w') as f:
+            f.write(json.dumps({"source": "agent1", "destination": "agent2", "content": "Hello"}) + '\n')
+        debugger.add_agent_log("agent1", agent_log)
+        debugger.add_agent_log("messages", messages_log)
+
+        client = debugger.app.test_client()
+        first = client.get('/updates').get_json()
+        assert [panel['agent_id'] for panel in first['panels']] == ['Global Messages', 'agent1']
+        assert [msg['content'] for msg in first['panels'][1]['messages']] == ["Hello"]
+
+        with open(messages_log, 'a') as f:
+            f.write(json.dumps({"source": "agent2", "destination": "agent1", "content": "Hi"}) + '\n')
+            f.write(json.dumps({"source": "agent3", "destination": "agent2", "content": "Hey"}) + '\n')
+        second = client.get(f"/updates?since={first['seq']}").get_json()
+        assert second['seq'] > first['seq']
+        assert [
+            (panel['agent_id'], 'content' in panel, [msg['content'] for msg in panel['messages']])
+            for panel in second['panels']
+        ] == [('Global Messages', False, ["Hi", "Hey"]), ('agent1', False, ["Hi"])]
+
+        with open(agent_log, 'a') as f:
+            f.write("\nStep 2")
+        third = client.get(f"/updates?since={second['seq']}").get_json()
+        assert third['panels'] == [{'agent_id': 'agent1', 'content': "Step 1\nStep 2", 'messages': []}]
+
+def test_updates_keep_only_recent_messages():
+    """Test that only the most recent messages are kept for the panels."""
+    debugger = VisualDebugger(max_messages=2)
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        messages_log = os.path.join(log_dir, "messages.jsonl")
+        with open(messages_log, 'w') as f:
+            for content in ("One", "Two", "Three"):
+                f.write(json.dumps({"source": "agent1", "destination": "agent2", "content": content}) + '\n')
+        debugger.add_agent_log("messages", messages_log)
+
+        client = debugger.app.test_client()
+        first = client.get('/updates').get_json()
+        assert [msg['content'] for msg in first['panels'][0]['messages']] == ["Two", "Three"]
+
+        with open(messages_log, 'a') as f:
+            f.write(json.dumps({"source": "agent2", "destination": "agent1", "content": "Four"}) + '\n')
+        second = client.get(f"/updates?since={first['seq']}").get_json()
+        assert [msg['content'] for msg in second['panels'][0]['messages']] == ["Four"]
+        assert [msg['content'] for msg in client.get('/updates').get_json()['panels'][0]['messages']] == ["Three", "Four"]
+
+def test_updates_number_messages_by_log_position():
+    """Test that each message carries its position in the messages log, for the page to scroll back to."""
+    debugger = VisualDebugger(max_messages=2)
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        messages_log = os.path.join(log_dir, "messages.jsonl")
+        with open(messages_log, 'w') as f:
+            for content in ("One", "Two", "Three"):
+                f.write(json.dumps({"source": "agent1", "destination": "agent2", "content": content}) + '\n')
+        debugger.add_agent_log("messages", messages_log)
+
+        client = debugger.app.test_client()
+        first = client.get('/updates').get_json()
+        assert [(msg['content'], msg['log_index']) for msg in first['panels'][0]['messages']] == [("Two", 1), ("Three", 2)]
+
+        with open(messages_log, 'a') as f:
+            f.write(json.dumps({"source": "agent2", "destination": "agent1", "content": "Four"}) + '\n')
+        second = client.get(f"/updates?since={first['seq']}").get_json()
+        assert [(msg['content'], msg['log_index']) for msg in second['panels'][0]['messages']] == [("Four", 3)]
+
+def test_updates_read_messages_appended_to_the_log():
+    """Test that updates pick up appended messages, waiting for lines still being written."""
+    debugger = VisualDebugger()
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        messages_log = os.path.join(log_dir, "messages.jsonl")
+        line = json.dumps({"source": "agent1", "destination": "agent2", "content": "Hello"})
+        with open(messages_log, 'w') as f:
+            f.write(line + '\nnot json\n' + line[:10])
+        debugger.add_agent_log("messages", messages_log)
+
+        client = debugger.app.test_client()
+        first = client.get('/updates').get_json()
+        assert [msg['content'] for msg in first['panels'][0]['messages']] == ["Hello"]
+
+        with open(messages_log, 'a') as f:
+            f.write(line[10:])
+        second = client.get(f"/updates?since={first['seq']}").get_json()
+        assert [msg['content'] for msg in second['panels'][0]['messages']] == ["Hello"]
+
+        with open(messages_log, 'a') as f:
+            f.write('\n')
+        assert client.get(f"/updates?since={second['seq']}").get_json()['panels'] == []
+
+def test_updates_carry_scratchpad_changes():
+    """Test that updates hold scratchpad changes from the first changed line when asked for."""
+    service = TeamScratchpad()
+    team_state = TeamState()
+    service.initialize_service(team_state)
+    scratchpads = team_state.get_service_data_store(service.get_name())["scratchpads"]
+    edited = datetime(2024, 1, 1)
+    scratchpads["plan"] = [LineInfo(f"Step {i}", "agent1", edited) for i in range(3)]
+
+    debugger = VisualDebugger()
+    debugger.add_team(SimpleNamespace(_name="team", _services=[service]))
+    debugger.register_state("team:team", team_state)
+    client = debugger.app.test_client()
+
+    assert 'scratchpads' not in client.get('/updates').get_json()
+    first = client.get('/updates?scratchpads_since=0').get_json()
+    assert [(pad['id'], pad['start'], [line['content'] for line in pad['lines']]) for pad in first['scratchpads']] == [
+        ("plan", 0, ["Step 0", "Step 1", "Step 2"])
+    ]
+
+    scratchpads["plan"][1] = LineInfo("Step 1, revised", "agent2", edited)
+    scratchpads["notes"] = [LineInfo("Note", "agent1", edited)]
+    second = client.get(f"/updates?since={first['seq']}&scratchpads_since={first['seq']}").get_json()
+    assert [(pad['id'], pad['start'], [line['content'] for line in pad['lines']]) for pad in second['scratchpads']] == [
+        ("plan", 1, ["Step 1, revised", "Step 2"]),
+        ("notes", 0, ["Note"]),
+    ]
+
+    del scratchpads["plan"][1:]
+    del scratchpads["notes"]
+    third = client.get(f"/updates?since={second['seq']}&scratchpads_since={second['seq']}").get_json()
+    assert third['scratchpads'] == [
+        {'id': "plan", 'start': 1, 'lines': []},
+        {'id': "notes", 'removed': True},
+    ]
+    assert client.get(f"/updates?since={third['seq']}&scratchpads_since={third['seq']}").get_json()['scratchpads'] == []
+
+def test_json_responses_are_gzipped_when_large():
+    """Test that large JSON responses are gzipped for clients that accept it."""
+    debugger = VisualDebugger()
+
+    with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
+        f.write("Agent output\n" * 200)
+        log_path = f.name
+
+    try:
+        debugger.add_agent_log("agent1", log_path)
+        client = debugger.app.test_client()
+        plain = client.get('/updates')
+        assert plain.headers.get('Content-Encoding') is None
+
+        compressed = client.get('/updates', headers={'Accept-Encoding': 'gzip, deflate'})
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in compressed.headers['Vary']
+        assert json.loads(gzip.decompress(compressed.data)) == plain.get_json()
+
+        small = client.get('/team_info', headers={'Accept-Encoding': 'gzip'})
+        assert small.headers.get('Content-Encoding') is None
+    finally:
+        os.unlink(log_path)
+
+def test_json_responses_are_not_modified_for_matching_etag():
+    """Test that JSON responses the client already has are answered with 304 Not Modified."""
+    debugger = VisualDebugger()
+
+    with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
+        f.write("Agent output")
+        log_path = f.name
+
+    try:
+        debugger.add_agent_log("agent1", log_path)
+        client = debugger.app.test_client()
+        for path in ('/updates?since=0', '/team_info'):
+            first = client.get(path)
+            assert first.status_code == 200
+            assert first.headers['Cache-Control'] == 'no-cache'
+            second = client.get(path, headers={'If-None-Match': first.headers['ETag']})
+            assert second.status_code == 304
+            assert second.data == b''
+
+        etag = client.get('/updates?since=0').headers['ETag']
+        with open(log_path, 'a') as f:
+            f.write("\nMore output")
+        changed = client.get('/updates?since=0', headers={'If-None-Match': etag})
+        assert changed.status_code == 200
+        assert changed.get_json()['panels'][0]['content'] == "Agent output\nMore output"
+    finally:
+        os.unlink(log_path)
+
+def test_events_endpoint_streams_updates():
+    """Test that the events endpoint pushes the panels as a server-sent event."""
+    debugger = VisualDebugger()
+
+    with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
+        f.write("Agent output")
+        log_path = f.name
+
+    try:
+        debugger.add_agent_log("agent1", log_path)
+        response = debugger.app.test_client().get('/events', buffered=False)
+        try:
+            assert response.mimetype == 'text/event-stream'
+            event_id, data = next(response.response).rstrip(b'\n').split(b'\n')
+            updates = json.loads(data[len(b'data: '):])
+            assert event_id == b'id: %d' % updates['seq']
+            assert updates['panels'][0]['content'] == "Agent output"
+        finally:
+            response.close()
+    finally:
+        os.unlink(log_path)
+
+def test_events_streams_share_one_refresher(monkeypatch):
+    """Test that open event streams are woken by one shared refresher instead of each polling."""
+    monkeypatch.setattr(visual_debugger, 'UPDATE_INTERVAL_SECONDS', 0.05)
+    debugger = VisualDebugger()
+
+    with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
+        f.write("Agent output")
+        log_path = f.name
+
+    try:
+        debugger.add_agent_log("agent1", log_path)
+        client = debugger.app.test_client()
+        responses = [client.get('/events', buffered=False) for _ in range(2)]
+        try:
+            for response in responses:
+                next(response.response)
+
+            refresh = debugger._refresh
+            refreshing_threads = set()
+            def record_refresh():
+                refreshing_threads.add(threading.current_thread())
+                refresh()
+            monkeypatch.setattr(debugger, '_refresh', record_refresh)
+
+            with open(log_path, 'a') as f:
+                f.write("\nMore output")
+            for response in responses:
+                data = next(response.response).rstrip(b'\n').split(b'\n')[1]
+                updates = json.loads(data[len(b'data: '):])
+                assert updates['panels'][0]['content'] == "Agent output\nMore output"
+            assert refreshing_threads == {debugger._refresher}
+        finally:
+            for response in responses:
+                response.close()
+
+        # The refresher stops once no stream is open
+        for _ in range(100):
+            if debugger._refresher is None:
+                break
+            time.sleep(0.05)
+        assert debugger._refresher is None
+    finally:
+        os.unlink(log_path)